@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import TOKEN_CLAIMS, TOKEN_VERSION_CACHE_KEY
+
+User = get_user_model()
+
+TOKEN_VERSION_CLAIM = 'token_version'
+
+
+class ClaimsAccessToken(AccessToken):
+    '''Токен доступа с ролью и правами пользователя в claims.'''
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for name in TOKEN_CLAIMS:
+            token[name] = getattr(user, name)
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
+
+
+def get_token_version(user_id):
+    key = TOKEN_VERSION_CACHE_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Реплика может не видеть отзыв токена: версия — из основной БД.
+        version = User.objects.using(DEFAULT_DB_ALIAS).filter(
+            pk=user_id
+        ).values_list('token_version', flat=True).first()
+        cache.set(key, version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    '''
+    Аутентификация по claims токена без запроса пользователя в БД.
+
+    Остальные поля пользователя загружаются при первом обращении к ним.
+    Токены без claims проверяются штатно, с загрузкой пользователя.
+    '''
+
+    def get_user(self, validated_token):
+        claims = {*TOKEN_CLAIMS, TOKEN_VERSION_CLAIM}
+        if not claims <= validated_token.payload.keys():
+            return super().get_user(validated_token)
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        version = validated_token[TOKEN_VERSION_CLAIM]
+        if version != get_token_version(user_id):
+            raise AuthenticationFailed('Токен отозван', code='token_revoked')
+        known = {name: validated_token[name] for name in claims}
+        known[User._meta.pk.attname] = user_id
+        field_names = [
+            field.attname for field in User._meta.concrete_fields
+            if field.attname in known
+        ]
+        user = User.from_db(
+            DEFAULT_DB_ALIAS, field_names,
+            [known[name] for name in field_names]
+        )
+        if not user.is_active:
+            raise AuthenticationFailed(
+                'Пользователь неактивен', code='user_inactive'
+            )
+        return user
@@ -23,4 +23,4 @@ class TitleFilter(filters.FilterSet):
 
     class Meta:
         model = Title
-        fields = '__all__'
+        fields = ('category', 'genre', 'name', 'year')
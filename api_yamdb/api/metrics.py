@@ -0,0 +1,127 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Верхние границы корзин гистограмм; последняя корзина — всё, что больше.
+TIME_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+PERCENTILES = (50, 95, 99)
+
+
+class Histogram:
+    '''Гистограмма с фиксированными корзинами: запись — O(log корзин).'''
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0
+        self.maximum = 0
+
+    def add(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+
+    def percentile(self, percent, count):
+        '''Верхняя граница корзины, в которую попадает перцентиль.'''
+        rank = count * percent / 100
+        seen = 0
+        for bound, bucket in zip(self.bounds, self.counts):
+            seen += bucket
+            if seen >= rank:
+                return bound
+        return self.maximum
+
+    def snapshot(self, count):
+        return {
+            'mean': round(self.total / count, 3) if count else None,
+            'max': round(self.maximum, 3),
+            **{
+                f'p{percent}': self.percentile(percent, count)
+                for percent in PERCENTILES
+            },
+            'buckets': {
+                **{
+                    str(bound): bucket
+                    for bound, bucket in zip(self.bounds, self.counts)
+                },
+                'inf': self.counts[-1],
+            },
+        }
+
+
+class RouteMetrics:
+    '''Время ответа, число и время запросов к БД одного маршрута.'''
+
+    def __init__(self):
+        self.count = 0
+        self.wall_ms = Histogram(TIME_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.db_ms = Histogram(TIME_BUCKETS)
+
+    def add(self, wall_ms, queries, db_ms):
+        self.count += 1
+        self.wall_ms.add(wall_ms)
+        self.queries.add(queries)
+        self.db_ms.add(db_ms)
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'wall_ms': self.wall_ms.snapshot(self.count),
+            'queries': self.queries.snapshot(self.count),
+            'db_ms': self.db_ms.snapshot(self.count),
+        }
+
+
+class MetricsRegistry:
+    '''
+    Метрики маршрутов в памяти процесса.
+
+    Запись берёт блокировку на время обновления нескольких счётчиков;
+    раз в METRICS_LOG_INTERVAL секунд сводка пишется в лог.
+    '''
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+        self.logged_at = time.monotonic()
+
+    def record(self, route, wall_ms, queries, db_ms):
+        with self.lock:
+            if route not in self.routes:
+                self.routes[route] = RouteMetrics()
+            self.routes[route].add(wall_ms, queries, db_ms)
+            now = time.monotonic()
+            log_due = now - self.logged_at >= settings.METRICS_LOG_INTERVAL
+            if log_due:
+                self.logged_at = now
+        if log_due:
+            self.log()
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                route: metrics.snapshot()
+                for route, metrics in sorted(self.routes.items())
+            }
+
+    def log(self):
+        for route, metrics in self.snapshot().items():
+            logger.info(
+                '%s count=%d wall_p95=%sms queries_p95=%s db_p95=%sms',
+                route, metrics['count'], metrics['wall_ms']['p95'],
+                metrics['queries']['p95'], metrics['db_ms']['p95']
+            )
+
+    def reset(self):
+        with self.lock:
+            self.routes = {}
+
+
+registry = MetricsRegistry()
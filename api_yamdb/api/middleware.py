@@ -0,0 +1,125 @@
+import asyncio
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.middleware.gzip import GZipMiddleware
+
+from .metrics import registry
+from .mixins import get_digest
+from .queries import QueryRecorder, check_repeated, current_recorder
+from api_yamdb.db_router import choose_replica, read_from
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PRIMARY_PIN_CACHE_KEY = 'db_primary_pin:{}'
+
+
+class WrappingMiddleware:
+    '''
+    Middleware для WSGI и ASGI: `wrap` — контекст вокруг ответа.
+
+    Как MiddlewareMixin Django: при асинхронном get_response
+    __call__ возвращает корутину и не занимает поток на весь запрос.
+    '''
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    @contextmanager
+    def wrap(self, request):
+        yield
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        with self.wrap(request):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with self.wrap(request):
+            return await self.get_response(request)
+
+
+class QueryMetricsMiddleware(WrappingMiddleware):
+    '''
+    Время ответа, число и время запросов к БД по маршрутам.
+
+    Маршрут — имя из resolver_match (например, api:titles-list);
+    запросы без маршрута не учитываются. Повторы одного вида SQL
+    больше QUERY_REPEAT_THRESHOLD раз за запрос считаются N+1.
+    '''
+
+    @contextmanager
+    def wrap(self, request):
+        recorder = QueryRecorder()
+        token = current_recorder.set(recorder)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            current_recorder.reset(token)
+        wall = time.perf_counter() - start
+        match = request.resolver_match
+        if match is not None:
+            registry.record(
+                match.view_name, wall * 1000, recorder.count,
+                recorder.duration * 1000
+            )
+            check_repeated(recorder, match.view_name)
+
+
+class ReplicaRoutingMiddleware(WrappingMiddleware):
+    '''
+    Чтение безопасных запросов из реплики, запись — в основную БД.
+
+    После записи клиент PRIMARY_PIN_SECONDS секунд читает из основной
+    БД и видит свои изменения, пока реплика догоняет. Клиент —
+    заголовок Authorization, а без него адрес: JWT проверяется позже,
+    в представлении.
+    '''
+
+    def get_pin_key(self, request):
+        return PRIMARY_PIN_CACHE_KEY.format(get_digest(
+            request.META.get('HTTP_AUTHORIZATION')
+            or request.META.get('REMOTE_ADDR')
+        ))
+
+    def get_read_alias(self, request):
+        key = self.get_pin_key(request)
+        if request.method not in SAFE_METHODS:
+            # Метка ставится до записи: её видят и параллельные чтения.
+            cache.set(key, True, settings.PRIMARY_PIN_SECONDS)
+            return None
+        if cache.get(key):
+            return None
+        return choose_replica()
+
+    @contextmanager
+    def wrap(self, request):
+        if not settings.READ_REPLICAS:
+            yield
+            return
+        with read_from(self.get_read_alias(request)):
+            yield
+
+
+class CompressionMiddleware(GZipMiddleware):
+    '''
+    gzip для ответов от COMPRESS_MIN_SIZE байт, если клиент его принимает.
+
+    Потоковые ответы сжимаются по частям, ответы с Content-Encoding
+    (предварительно сжатая статика) отдаются как есть.
+    '''
+
+    def process_response(self, request, response):
+        if (
+            not response.streaming
+            and len(response.content) < settings.COMPRESS_MIN_SIZE
+        ):
+            return response
+        return super().process_response(request, response)
@@ -0,0 +1,264 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.utils.http import parse_etags, urlencode
+from rest_framework import permissions, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from api_yamdb.db_router import read_alias
+from reviews.versions import get_versions, recently_bumped
+
+
+def normalized_query(request):
+    '''Параметры запроса в порядке, не зависящем от клиента.'''
+    return urlencode(sorted(request.query_params.lists()), doseq=True)
+
+
+def get_digest(*parts):
+    return hashlib.md5('|'.join(map(str, parts)).encode()).hexdigest()
+
+
+class ModelVersionsMixin:
+    '''Версии моделей `version_models`, из которых строится ответ.'''
+    version_models = ()
+
+    def get_version_models(self):
+        return self.version_models
+
+    def get_model_versions(self):
+        # Представление создаётся на каждый запрос, версии читаются раз.
+        if not hasattr(self, '_model_versions'):
+            self._model_versions = get_versions(self.get_version_models())
+        return self._model_versions
+
+    def versions_match_data(self):
+        '''
+        Реплика может отставать от версий: сразу после записи ответ
+        из неё не получает ETag и не попадает в кэш, иначе старые
+        данные отдавались бы под новыми версиями.
+        '''
+        return (
+            read_alias.get() is None
+            or not recently_bumped(self.get_version_models())
+        )
+
+
+class ConditionalListMixin(ModelVersionsMixin):
+    '''
+    Условные GET-запросы для list по ETag.
+
+    ETag строится по пути, параметрам запроса и версиям моделей
+    ответа, поэтому 304 отдаётся без запросов к БД и сериализации.
+    '''
+
+    def get_etag(self, request):
+        return '"{}"'.format(get_digest(
+            request.path, normalized_query(request),
+            request.accepted_renderer.format, *self.get_model_versions()
+        ))
+
+    def get_conditional_response(self, action, request, *args, **kwargs):
+        if not self.versions_match_data():
+            return action(request, *args, **kwargs)
+        etag = self.get_etag(request)
+        # Слабое сравнение: сжатый ответ получает W/ к ETag.
+        if_none_match = {
+            tag[2:] if tag.startswith('W/') else tag
+            for tag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+        }
+        if etag in if_none_match or '*' in if_none_match:
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag}
+            )
+        response = action(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class ConditionalGetMixin(ConditionalListMixin):
+    '''Условные GET-запросы для list и retrieve по ETag.'''
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class CachedListMixin(ModelVersionsMixin):
+    '''
+    Кэш данных ответа list.
+
+    Ключ включает версии моделей ответа: любая запись в них, в том числе
+    через админку, меняет ключ, и устаревшие записи кэша не читаются.
+    Ответ из реплики может отставать от версий: сразу после записи
+    он не кэшируется, а позже хранится не дольше PRIMARY_PIN_SECONDS —
+    времени, за которое реплика догоняет основную БД.
+    '''
+    cache_anonymous_only = False
+
+    def get_cache_timeout(self):
+        if read_alias.get() is None:
+            return settings.API_CACHE_TIMEOUT
+        return settings.PRIMARY_PIN_SECONDS
+
+    def list(self, request, *args, **kwargs):
+        if self.cache_anonymous_only and request.user.is_authenticated:
+            return super().list(request, *args, **kwargs)
+        key = 'api_list:' + get_digest(
+            request.path, normalized_query(request),
+            *self.get_model_versions()
+        )
+        data = cache.get(key)
+        if data is None:
+            response = super().list(request, *args, **kwargs)
+            if (
+                response.status_code == status.HTTP_200_OK
+                and self.versions_match_data()
+            ):
+                cache.set(key, response.data, self.get_cache_timeout())
+            return response
+        return Response(data)
+
+
+def split_names(value):
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+class SparseFieldsMixin:
+    '''
+    Выборочные поля ответа: `?fields=id,name` или `?exclude=description`.
+
+    Лишние поля убирает сериализатор по `context['fields']`, а
+    `only_requested` не загружает из БД колонки, которые не попадут
+    в ответ. Колонки поля задаёт `field_columns`, по умолчанию это
+    одноимённое поле модели; `required_columns` загружаются всегда.
+    '''
+    fields_query_param = 'fields'
+    exclude_query_param = 'exclude'
+    sparse_actions = ('list', 'retrieve')
+    field_columns = {}
+    required_columns = ()
+
+    def get_field_names(self):
+        return self.get_serializer_class().Meta.fields
+
+    def get_requested_fields(self):
+        '''Поля ответа по порядку или None, если клиент их не выбирал.'''
+        if not hasattr(self, '_requested_fields'):
+            self._requested_fields = self.parse_requested_fields()
+        return self._requested_fields
+
+    def parse_requested_fields(self):
+        params = self.request.query_params
+        if self.action not in self.sparse_actions or not (
+            self.fields_query_param in params
+            or self.exclude_query_param in params
+        ):
+            return None
+        names = self.get_field_names()
+        errors = {}
+        selected = {}
+        for param in (self.fields_query_param, self.exclude_query_param):
+            selected[param] = split_names(params.get(param, ''))
+            unknown = selected[param] - set(names)
+            if unknown:
+                errors[param] = [
+                    'Неизвестные поля: {}. Доступны: {}.'.format(
+                        ', '.join(sorted(unknown)), ', '.join(names)
+                    )
+                ]
+        if errors:
+            raise ValidationError(errors)
+        requested = selected[self.fields_query_param] or set(names)
+        return tuple(
+            name for name in names
+            if name in requested
+            and name not in selected[self.exclude_query_param]
+        )
+
+    def is_requested(self, name):
+        fields = self.get_requested_fields()
+        return fields is None or name in fields
+
+    def only_requested(self, queryset):
+        fields = self.get_requested_fields()
+        if fields is None:
+            return queryset
+        # Поля курсора читаются у последнего объекта страницы.
+        columns = {
+            'pk', *self.required_columns,
+            *getattr(self, 'cursor_ordering', ())
+        }
+        for name in fields:
+            columns.update(self.field_columns.get(name, (name, )))
+        return queryset.only(*columns)
+
+    def get_serializer_context(self):
+        return {
+            **super().get_serializer_context(),
+            'fields': self.get_requested_fields(),
+        }
+
+
+@lru_cache(maxsize=None)
+def get_read_executor():
+    '''
+    Пул потоков чтения: чтение ждёт БД, а не процессор, поэтому
+    размер задаёт ASYNC_READ_THREADS, а не число ядер.
+    '''
+    return ThreadPoolExecutor(
+        settings.ASYNC_READ_THREADS, thread_name_prefix='async-read'
+    )
+
+
+def render_read(view, request, *args, **kwargs):
+    '''Чтение целиком в потоке пула: запросы к БД и рендеринг.'''
+    try:
+        response = view(request, *args, **kwargs)
+        response.render()
+        return response
+    finally:
+        # Соединения потоков пула закрываются как после запроса WSGI.
+        close_old_connections()
+
+
+class AsyncReadMixin:
+    '''
+    Асинхронное представление под ASGI, если включён ASYNC_READS.
+
+    Безопасные запросы выполняются в пуле потоков и не ждут друг
+    друга и цикл событий; запись идёт в общем потоке синхронного
+    кода, как у синхронных представлений под ASGI.
+    '''
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        if not settings.ASYNC_READS:
+            return view
+        read = sync_to_async(
+            partial(render_read, view), thread_sensitive=False,
+            executor=get_read_executor()
+        )
+        write = sync_to_async(view, thread_sensitive=True)
+
+        async def async_view(request, *args, **kwargs):
+            if request.method in permissions.SAFE_METHODS:
+                return await read(request, *args, **kwargs)
+            return await write(request, *args, **kwargs)
+
+        # cls, actions и csrf_exempt читают роутер и CsrfViewMiddleware.
+        async_view.__dict__.update(view.__dict__)
+        return async_view
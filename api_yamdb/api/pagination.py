@@ -0,0 +1,38 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class OptionalCursorPagination(PageNumberPagination):
+    '''
+    Постраничная пагинация с режимом курсора по запросу.
+
+    Представление включает режим курсора, задав `cursor_ordering`.
+    Клиент переходит в него параметром `?pagination=cursor`.
+    '''
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+
+    def get_cursor_paginator(self, request, view):
+        ordering = getattr(view, 'cursor_ordering', None)
+        if (
+            ordering is None
+            or request.query_params.get(self.mode_query_param)
+            != self.cursor_mode
+        ):
+            return None
+        paginator = CursorPagination()
+        paginator.ordering = ordering
+        paginator.page_size = self.page_size
+        return paginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = self.get_cursor_paginator(request, view)
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
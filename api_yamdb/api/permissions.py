@@ -27,4 +27,4 @@ class IsAuthorAdminModeratorOrReadOnly(IsAdmin):
         return (request.method in permissions.SAFE_METHODS
                 or (super().has_permission(request, view)
                     or request.user.is_moderator()
-                    or obj.author == request.user))
+                    or obj.author_id == request.user.id))
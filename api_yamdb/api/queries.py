@@ -0,0 +1,108 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from functools import lru_cache
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+PLACEHOLDER_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+WHITESPACE = re.compile(r'\s+')
+
+
+# QueryRecorder текущего запроса: контекст переходит и в потоки,
+# где sync_to_async выполняет ORM асинхронных представлений.
+current_recorder = ContextVar('current_recorder', default=None)
+
+
+class RepeatedQueriesError(Exception):
+    pass
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql):
+    '''Вид запроса: SQL без литералов и с IN-списками любой длины.'''
+    sql = sql.replace('%s', '?')
+    sql = STRING_LITERAL.sub('?', sql)
+    sql = NUMBER_LITERAL.sub('?', sql)
+    sql = PLACEHOLDER_LIST.sub('(...)', sql)
+    return WHITESPACE.sub(' ', sql).strip()
+
+
+class QueryRecorder:
+    '''
+    execute_wrapper, считающий запросы к БД, их время и повторы вида.
+
+    Запросы дольше SLOW_QUERY_MS пишутся в лог.
+    '''
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.count += 1
+            self.duration += duration
+            shape = normalize_sql(sql)
+            self.shapes[shape] += 1
+            if duration * 1000 >= settings.SLOW_QUERY_MS:
+                logger.warning(
+                    'Медленный запрос %.1f мс: %s', duration * 1000, shape
+                )
+
+    def repeated(self, threshold):
+        '''Виды запросов, выполненные больше threshold раз.'''
+        return {
+            shape: count for shape, count in self.shapes.items()
+            if count > threshold
+        }
+
+
+def check_repeated(recorder, route, threshold=None, action=None):
+    '''
+    Реакция на N+1: QUERY_REPEAT_ACTION warn пишет в лог, raise
+    выбрасывает RepeatedQueriesError.
+    '''
+    if threshold is None:
+        threshold = settings.QUERY_REPEAT_THRESHOLD
+    repeated = recorder.repeated(threshold)
+    if not repeated:
+        return
+    message = f'{route}: повторы запросов ' + '; '.join(
+        f'{count}× {shape}' for shape, count in repeated.items()
+    )
+    if (action or settings.QUERY_REPEAT_ACTION) == 'raise':
+        raise RepeatedQueriesError(message)
+    logger.warning(message)
+
+
+def record_current(execute, sql, params, many, context):
+    recorder = current_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_recorder(sender, connection, **kwargs):
+    '''
+    Постоянный execute_wrapper соединения для current_recorder.
+
+    Встаёт первым: execute_wrapper() снимает с конца списка только
+    свои обёртки.
+    '''
+    if record_current not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_current)
@@ -3,8 +3,8 @@ from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
 from reviews.models import (
-    MAX_LENGTH_EMAIL, MAX_LENGTH_USERNAME, Category, Comment, Genre, Review,
-    Title
+    MAX_LENGTH_EMAIL, MAX_LENGTH_TEXT, MAX_LENGTH_USERNAME, Category, Comment,
+    Genre, Review, Title, TitleStats
 )
 from reviews.validators import validate_username
 
@@ -48,6 +48,28 @@ class UserSerializer(UserSerializerForAdmin):
     class Meta(UserSerializerForAdmin.Meta):
         read_only_fields = ('role', )
 
+    def update(self, instance, validated_data):
+        # Только изменённые поля: одновременная смена роли
+        # администратором не перезаписывается.
+        for name, value in validated_data.items():
+            setattr(instance, name, value)
+        instance.save(update_fields=validated_data.keys())
+        return instance
+
+
+class SparseFieldsSerializerMixin:
+    '''Оставляет поля context['fields'], если представление их задало.'''
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested = self.context.get('fields')
+        if requested is None:
+            return fields
+        return {
+            name: field for name, field in fields.items()
+            if name in requested
+        }
+
 
 class CategorySerializer(serializers.ModelSerializer):
     class Meta:
@@ -61,7 +83,21 @@ class GenreSerializer(serializers.ModelSerializer):
         model = Genre
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class TitleStatsSerializer(serializers.ModelSerializer):
+    scores = serializers.DictField(
+        child=serializers.IntegerField(), read_only=True
+    )
+
+    class Meta:
+        fields = (
+            'review_count', 'comment_count', 'last_review_date', 'scores'
+        )
+        model = TitleStats
+
+
+class TitleReadSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(
         read_only=True,
@@ -75,6 +111,12 @@ class TitleReadSerializer(serializers.ModelSerializer):
         )
         model = Title
 
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.context.get('include_stats'):
+            fields['stats'] = TitleStatsSerializer(read_only=True)
+        return fields
+
 
 class TitleWriteSerializer(serializers.ModelSerializer):
     category = serializers.SlugRelatedField(
@@ -97,29 +139,26 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         return TitleReadSerializer(instance).data
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     author = serializers.SlugRelatedField(
         read_only=True, slug_field='username'
     )
+    text = serializers.CharField(max_length=MAX_LENGTH_TEXT)
 
     class Meta:
         fields = ('id', 'text', 'author', 'score', 'pub_date')
         model = Review
 
-    def validate(self, data):
-        if self.context['request'].method == 'POST' and Review.objects.filter(
-            author=self.context['request'].user,
-            title_id=self.context['view'].kwargs.get('title_id')
-        ).exists():
-            raise serializers.ValidationError(
-                'Нельзя оставить два отзыва на одно произведение.')
-        return data
 
-
-class CommentsSerializer(serializers.ModelSerializer):
+class CommentsSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     author = serializers.SlugRelatedField(
         read_only=True, slug_field='username'
     )
+    text = serializers.CharField(max_length=MAX_LENGTH_TEXT)
 
     class Meta:
         fields = ('id', 'text', 'author', 'pub_date')
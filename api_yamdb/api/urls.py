@@ -1,9 +1,10 @@
-from django.urls import include, path
+from django.urls import include, path, re_path
 from rest_framework.routers import SimpleRouter
 
 from .views import (
-    CategoryViewSet, CommentsViewSet, GenreViewSet, ReviewViewSet,
-    TitleViewSet, UserViewSet, give_token, signup
+    CategoryViewSet, CommentsViewSet, ExportView, GenreViewSet,
+    ReviewViewSet, SearchViewSet, TitleViewSet, UserViewSet, give_token,
+    metrics, signup
 )
 
 app_name = 'api'
@@ -12,6 +13,7 @@ router_v1.register('users', UserViewSet, basename='users')
 router_v1.register('categories', CategoryViewSet, basename='categories')
 router_v1.register('genres', GenreViewSet, basename='genres')
 router_v1.register('titles', TitleViewSet, basename='titles')
+router_v1.register('search', SearchViewSet, basename='search')
 router_v1.register(
     r'titles/(?P<title_id>\d+)/reviews',
     ReviewViewSet,
@@ -31,4 +33,9 @@ auth_patterns = [
 urlpatterns = [
     path('v1/', include(router_v1.urls)),
     path('v1/auth/', include(auth_patterns)),
+    path('v1/metrics/', metrics, name='metrics'),
+    re_path(
+        r'^v1/export/(?P<dataset>\w+)\.(?P<file_format>csv|ndjson)$',
+        ExportView.as_view(), name='export'
+    ),
 ]
@@ -2,34 +2,50 @@ import random
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
-from django.db import IntegrityError
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins, status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.filters import SearchFilter
 from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
-from rest_framework_simplejwt.tokens import RefreshToken
 
+from .authentication import ClaimsAccessToken
 from .filters import TitleFilter
+from .metrics import registry
+from .mixins import (
+    AsyncReadMixin, CachedListMixin, ConditionalGetMixin,
+    ConditionalListMixin, SparseFieldsMixin
+)
 from .permissions import (
     IsAdmin, IsAdminOrReadOnly, IsAuthorAdminModeratorOrReadOnly
 )
 from .serializers import (
     CategorySerializer, CommentsSerializer, GenreSerializer, ReviewSerializer,
-    SignupSerializer, TitleReadSerializer, TitleWriteSerializer,
-    TokenSerializer, UserSerializer, UserSerializerForAdmin
+    SignupSerializer, TitleReadSerializer, TitleStatsSerializer,
+    TitleWriteSerializer, TokenSerializer, UserSerializer,
+    UserSerializerForAdmin
+)
+from reviews.export import DATASETS, FORMATS, get_file_name, stream
+from reviews.models import (
+    Category, Comment, Genre, OutgoingEmail, Review, Title, TitleStats
 )
-from reviews.models import Category, Genre, Review, Title
+from reviews.search import get_search_index, tokenize
 
 User = get_user_model()
 
 ERROR_IN_USE = 'Используется другим пользователем'
+ERROR_DOUBLE_REVIEW = 'Нельзя оставить два отзыва на одно произведение.'
+STATS_COLUMNS = tuple(
+    f'stats__{field.name}' for field in TitleStats._meta.concrete_fields
+    if not field.primary_key
+)
 
 
 @api_view(['POST'])
@@ -39,8 +55,23 @@ def signup(request):
     serializer.is_valid(raise_exception=True)
     email = serializer.data['email']
     username = serializer.data['username']
+    confirmation_code = ''.join(
+        random.choice(settings.CODE_CHARACTERS)
+        for _ in range(settings.MAX_LENGTH_CODE)
+    )
     try:
-        user, _ = User.objects.get_or_create(email=email, username=username)
+        with transaction.atomic():
+            user, _ = User.objects.get_or_create(
+                email=email, username=username
+            )
+            user.confirmation_code = confirmation_code
+            user.save()
+            OutgoingEmail.objects.create(
+                subject='Код подтверждения',
+                body=f'Ваш код подтверждения: {confirmation_code}',
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                recipient=email,
+            )
     except IntegrityError:
         result = {}
         if User.objects.filter(username=username).exists():
@@ -50,19 +81,6 @@ def signup(request):
         else:
             result['email'] = [email, ERROR_IN_USE]
         raise ValidationError(result)
-    confirmation_code = ''.join(
-        random.choice(settings.CODE_CHARACTERS)
-        for _ in range(settings.MAX_LENGTH_CODE)
-    )
-    send_mail(
-        'Код подтверждения',
-        f'Ваш код подтверждения: {confirmation_code}',
-        settings.DEFAULT_FROM_EMAIL,
-        [email],
-        fail_silently=False,
-    )
-    user.confirmation_code = confirmation_code
-    user.save()
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -82,13 +100,38 @@ def give_token(request):
         user.confirmation_code = settings.INVALID_CODE
         user.save()
         raise ValidationError({'confirmation_code': ['Неверный код доступа']})
-    refresh = RefreshToken.for_user(user)
     data = {
-        'token': str(refresh.access_token)
+        'token': str(ClaimsAccessToken.for_user(user))
     }
     return Response(data, status=status.HTTP_200_OK)
 
 
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def metrics(request):
+    return Response(registry.snapshot(), status=status.HTTP_200_OK)
+
+
+class ExportView(APIView):
+    '''Потоковая выгрузка набора данных в CSV или NDJSON.'''
+    permission_classes = [IsAdmin]
+
+    def perform_content_negotiation(self, request, force=False):
+        # Ответ — не Response, рендереры DRF к выгрузке не применяются.
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, dataset, file_format):
+        if dataset not in DATASETS:
+            raise NotFound(f'Нет набора данных {dataset}')
+        response = StreamingHttpResponse(
+            stream(dataset, file_format), content_type=FORMATS[file_format]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{get_file_name(dataset, file_format)}"'
+        )
+        return response
+
+
 class UserViewSet(ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializerForAdmin
@@ -105,10 +148,12 @@ class UserViewSet(ModelViewSet):
         url_path=settings.SELF_PROFILE_NAME
     )
     def profile(self, request):
-        user = request.user
         if request.method == 'GET':
-            serializer = UserSerializer(user)
+            serializer = UserSerializer(request.user)
             return Response(serializer.data, status=status.HTTP_200_OK)
+        # Роль и версия токена из claims могут быть устаревшими:
+        # запись идёт через строку из БД.
+        user = get_object_or_404(User, pk=request.user.pk)
         serializer = UserSerializer(user, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
@@ -116,8 +161,8 @@ class UserViewSet(ModelViewSet):
 
 
 class ClassificationViewSet(
-    mixins.CreateModelMixin, mixins.ListModelMixin,
-    mixins.DestroyModelMixin, viewsets.GenericViewSet
+    ConditionalListMixin, CachedListMixin, mixins.CreateModelMixin,
+    mixins.ListModelMixin, mixins.DestroyModelMixin, viewsets.GenericViewSet
 ):
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = (SearchFilter, )
@@ -128,59 +173,167 @@ class ClassificationViewSet(
 class CategoryViewSet(ClassificationViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    version_models = (Category, )
 
 
 class GenreViewSet(ClassificationViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    version_models = (Genre, )
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    ).order_by('name')
+class TitleViewSet(
+    AsyncReadMixin, SparseFieldsMixin, ConditionalGetMixin, CachedListMixin,
+    viewsets.ModelViewSet
+):
+    queryset = Title.objects.all()
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = (DjangoFilterBackend, )
     filterset_class = TitleFilter
+    cursor_ordering = ('name', 'id')
+    version_models = (Title, Genre, Category, Review)
+    cache_anonymous_only = True
     http_method_names = ['get', 'post', 'patch', 'delete']
+    field_columns = {
+        'rating': ('rating_sum', 'rating_count'),
+        'genre': (),
+        'category': ('category__name', 'category__slug'),
+        'stats': STATS_COLUMNS,
+    }
+
+    def include_stats(self):
+        include = self.request.query_params.get('include', '')
+        return 'stats' in include.split(',')
+
+    def get_field_names(self):
+        if self.include_stats():
+            return super().get_field_names() + ('stats', )
+        return super().get_field_names()
+
+    def get_queryset(self):
+        # Связи загружаются, только если их поля попадут в ответ.
+        queryset = super().get_queryset()
+        if self.is_requested('category'):
+            queryset = queryset.select_related('category')
+        if self.is_requested('genre'):
+            queryset = queryset.prefetch_related('genre')
+        if self.include_stats() and self.is_requested('stats'):
+            queryset = queryset.select_related('stats')
+        return self.only_requested(queryset)
+
+    def get_version_models(self):
+        if self.include_stats():
+            # Статистику меняют отзывы, комментарии и её пересчёт.
+            return self.version_models + (Comment, TitleStats)
+        return self.version_models
+
+    def get_serializer_context(self):
+        return {
+            **super().get_serializer_context(),
+            'include_stats': (
+                self.include_stats() and self.is_requested('stats')
+            ),
+        }
 
     def get_serializer_class(self):
         if self.action in ('list', 'retrieve'):
             return TitleReadSerializer
         return TitleWriteSerializer
 
+    @action(detail=True)
+    def stats(self, request, pk=None):
+        # GET только читает (возможно, с реплики): недостающие строки
+        # создаёт rebuild_title_stats.
+        stats = get_object_or_404(TitleStats, title_id=pk)
+        return Response(TitleStatsSerializer(stats).data)
+
+
+class SearchViewSet(viewsets.GenericViewSet):
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre')
+    serializer_class = TitleReadSerializer
+    permission_classes = [IsAdminOrReadOnly]
+
+    def list(self, request):
+        tokens = tokenize(request.query_params.get('q', ''))
+        if not tokens:
+            raise ValidationError({'q': ['Укажите слова для поиска']})
+        page = self.paginate_queryset(
+            get_search_index().search(tokens, settings.SEARCH_MAX_RESULTS)
+        )
+        titles = self.get_queryset().in_bulk(page)
+        serializer = self.get_serializer(
+            [titles[pk] for pk in page if pk in titles], many=True
+        )
+        return self.get_paginated_response(serializer.data)
+
+
+class AuthorSparseFieldsMixin(SparseFieldsMixin):
+    '''Выборочные поля отзывов и комментариев с автором по username.'''
+    field_columns = {'author': ('author__username', )}
+
+    def author_queryset(self, queryset):
+        if self.is_requested('author'):
+            queryset = queryset.select_related('author')
+        return self.only_requested(queryset)
+
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+    AsyncReadMixin, AuthorSparseFieldsMixin, ConditionalGetMixin,
+    viewsets.ModelViewSet
+):
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthorAdminModeratorOrReadOnly]
+    cursor_ordering = ('pub_date', 'id')
+    version_models = (Review, Title, User)
     http_method_names = ['get', 'post', 'patch', 'delete']
+    # Связанный менеджер проставляет произведение каждому отзыву.
+    required_columns = ('title', )
 
     def get_title(self):
-        return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
+        # Экземпляр представления живёт один запрос.
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title, pk=self.kwargs.get('title_id')
+            )
+        return self._title
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        return self.author_queryset(self.get_title().reviews.all())
 
     def perform_create(self, serializer):
-        serializer.save(
-            author=self.request.user, title=self.get_title()
-        )
+        # Повторный отзыв отсекает ограничение unique_author_title.
+        try:
+            serializer.save(
+                author=self.request.user, title=self.get_title()
+            )
+        except IntegrityError:
+            raise ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [ERROR_DOUBLE_REVIEW]}
+            )
 
 
-class CommentsViewSet(viewsets.ModelViewSet):
+class CommentsViewSet(
+    AsyncReadMixin, AuthorSparseFieldsMixin, viewsets.ModelViewSet
+):
     permission_classes = [IsAuthorAdminModeratorOrReadOnly]
     serializer_class = CommentsSerializer
+    cursor_ordering = ('pub_date', 'id')
     http_method_names = ['get', 'post', 'patch', 'delete']
+    required_columns = ('review', )
 
     def get_review(self):
-        return get_object_or_404(
-            Review, pk=self.kwargs.get('review_id'),
-            title_id=self.kwargs.get('title_id')
-        )
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review, pk=self.kwargs.get('review_id'),
+                title_id=self.kwargs.get('title_id')
+            )
+        return self._review
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        return self.author_queryset(self.get_review().comments.all())
 
     def perform_create(self, serializer):
         serializer.save(
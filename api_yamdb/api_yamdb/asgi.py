@@ -1,7 +1,14 @@
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+
+from api_yamdb.handlers import StreamingASGIHandler
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+# Чтение произведений, отзывов и комментариев не занимает общий поток
+# синхронного кода; ASYNC_READS=0 возвращает синхронные представления.
+os.environ.setdefault('ASYNC_READS', '1')
 
-application = get_asgi_application()
+# Как get_asgi_application, но потоковые ответы читаются вне цикла событий.
+django.setup(set_prefix=False)
+application = StreamingASGIHandler()
@@ -0,0 +1,50 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Псевдоним БД для чтения в текущем запросе; None — основная БД.
+read_alias = ContextVar('read_alias', default=None)
+
+
+@contextmanager
+def read_from(alias):
+    token = read_alias.set(alias)
+    try:
+        yield
+    finally:
+        read_alias.reset(token)
+
+
+def choose_replica():
+    if not settings.READ_REPLICAS:
+        return None
+    return random.choice(settings.READ_REPLICAS)
+
+
+class PrimaryReplicaRouter:
+    '''
+    Запись — в основную БД, чтение — в реплику, выбранную на запрос.
+
+    Реплику выбирает ReplicaRoutingMiddleware; вне запроса и внутри
+    транзакции основной БД чтение идёт в основную БД.
+    '''
+
+    def db_for_read(self, model, **hints):
+        alias = read_alias.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики — копии основной БД, объекты из них связываются.
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Схема попадает в реплики вместе с данными.
+        return db not in settings.READ_REPLICAS
@@ -1,3 +1,4 @@
+import os
 import string
 from datetime import timedelta
 from pathlib import Path
@@ -30,6 +31,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.QueryMetricsMiddleware',
+    'api.middleware.ReplicaRoutingMiddleware',
+    'api.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -59,6 +63,11 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
+ASGI_APPLICATION = 'api_yamdb.asgi.application'
+# Асинхронные list и retrieve произведений, отзывов и комментариев;
+# включает asgi.py, под WSGI они лишь добавили бы цикл событий.
+ASYNC_READS = os.environ.get('ASYNC_READS') == '1'
+ASYNC_READ_THREADS = 32
 
 
 # Database
@@ -69,6 +78,29 @@ DATABASES = {
         'NAME': BASE_DIR / 'db.sqlite3',
     }
 }
+# Реплики для чтения — файлы SQLite через запятую в DATABASE_REPLICAS.
+READ_REPLICAS = []
+for number, name in enumerate(
+    filter(None, os.environ.get('DATABASE_REPLICAS', '').split(',')), 1
+):
+    READ_REPLICAS.append(f'replica{number}')
+    DATABASES[f'replica{number}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['api_yamdb.db_router.PrimaryReplicaRouter']
+# После записи клиент столько секунд читает из основной БД.
+PRIMARY_PIN_SECONDS = 5
+# Применяются к каждому соединению SQLite по порядку.
+SQLITE_PRAGMAS = {
+    'busy_timeout': 5000,
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    # Отрицательное значение — размер кэша страниц в КиБ.
+    'cache_size': -64 * 1024,
+}
 
 
 # Password validation
@@ -110,24 +142,90 @@ STATIC_URL = '/static/'
 
 STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
+STATIC_ROOT = BASE_DIR / 'static_root'
+
+STATICFILES_STORAGE = (
+    'api_yamdb.staticfiles.CompressedManifestStaticFilesStorage'
+)
+# Меньшие ответы и файлы статики не сжимаются, байты.
+COMPRESS_MIN_SIZE = 1024
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAdminUser',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.ClaimsJWTAuthentication',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.OptionalCursorPagination',
     'PAGE_SIZE': 10,
+    # В продакшене только JSON: браузерный рендерер строит формы
+    # со всеми категориями и жанрами.
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        *(['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []),
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        *([
+            'rest_framework.parsers.FormParser',
+            'rest_framework.parsers.MultiPartParser',
+        ] if DEBUG else []),
+    ],
 }
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
+# Версии моделей, кэш списков и закрепление за основной БД должны быть
+# общими для всех процессов: при нескольких воркерах задайте MEMCACHED
+# (host:port, нужен pymemcache). Кэш в памяти процесса — для одного воркера.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+if os.environ.get('MEMCACHED'):
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'LOCATION': os.environ['MEMCACHED'],
+    }
+TOKEN_VERSION_CACHE_TIMEOUT = 60
+API_CACHE_TIMEOUT = 60 * 60
+# Время жизни версии модели от её создания. В кэше процесса запись в другом
+# воркере не меняет версию здесь: списки и ETag устаревают не дольше этого.
+MODEL_VERSION_TIMEOUT = None if os.environ.get('MEMCACHED') else 60
+# auto: FTS5, если SQLite его поддерживает, иначе таблица слов (terms).
+SEARCH_INDEX = 'auto'
+SEARCH_MAX_RESULTS = 1000
+# Период записи сводки метрик маршрутов в лог, секунды.
+METRICS_LOG_INTERVAL = 60
+SLOW_QUERY_MS = 100
+# Больше стольких запросов одного вида за запрос — N+1: warn пишет
+# в лог, raise выбрасывает исключение.
+QUERY_REPEAT_THRESHOLD = 5
+QUERY_REPEAT_ACTION = 'warn'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'api.metrics': {'handlers': ['console'], 'level': 'INFO'},
+        'api.queries': {'handlers': ['console'], 'level': 'WARNING'},
+    },
+}
 
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 DEFAULT_FROM_EMAIL = 'yamdb-team5@yandex.ru'
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = timedelta(minutes=1)
+# Письмо, занятое процессом отправки, другие процессы не берут столько.
+EMAIL_OUTBOX_LEASE = timedelta(minutes=5)
 
 SELF_PROFILE_NAME = 'me'
 INVALID_CODE = 'INVALID_CODE'
@@ -0,0 +1,125 @@
+import gzip
+import mimetypes
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import (
+    ManifestStaticFilesStorage, staticfiles_storage
+)
+from django.core.files.base import ContentFile
+from django.http import FileResponse, Http404
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.functional import cached_property
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.html', '.js', '.json', '.map', '.svg', '.txt', '.xml', '.yaml',
+    '.yml',
+)
+# Имена с хэшем содержимого не меняются: кэш на год.
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def get_encoders():
+    '''Content-Encoding -> (расширение файла, функция сжатия).'''
+    encoders = {'gzip': ('.gz', lambda data: gzip.compress(data, 9, mtime=0))}
+    if brotli is not None:
+        encoders['br'] = ('.br', brotli.compress)
+    return encoders
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    '''
+    Статика с хэшем в имени и сжатыми копиями .gz (и .br с brotli).
+
+    Копии пишутся в collectstatic один раз; файлы меньше
+    COMPRESS_MIN_SIZE и копии не короче оригинала не сохраняются.
+    '''
+
+    @cached_property
+    def hashed_names(self):
+        '''Имена с хэшем для проверки на каждый запрос статики.'''
+        return frozenset(self.hashed_files.values())
+
+    def stored_name(self, name):
+        # До первого collectstatic манифеста нет: имена без хэша.
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        # Файл может пройти несколько проходов: важен последний хэш.
+        hashed_names = {}
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            if not isinstance(processed, Exception):
+                hashed_names[name] = hashed_name
+            yield name, hashed_name, processed
+        # Манифест заполнен заново: множество имён строится по нему.
+        self.__dict__.pop('hashed_names', None)
+        if dry_run:
+            return
+        for name, hashed_name in hashed_names.items():
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self.compress(name)
+                self.compress(hashed_name)
+
+    def compress(self, name):
+        with self.open(name) as file:
+            content = file.read()
+        if len(content) < settings.COMPRESS_MIN_SIZE:
+            return
+        for extension, encode in get_encoders().values():
+            compressed = encode(content)
+            if len(compressed) >= len(content):
+                continue
+            if self.exists(name + extension):
+                self.delete(name + extension)
+            self._save(name + extension, ContentFile(compressed))
+
+
+def is_hashed(path):
+    return path in getattr(staticfiles_storage, 'hashed_names', ())
+
+
+def serve_static(request, path):
+    '''
+    Файл из STATIC_ROOT, сжатая копия — по Accept-Encoding.
+
+    Имена с хэшем кэшируются клиентом на год без перепроверки.
+    '''
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except ValueError:
+        raise Http404(path)
+    if not os.path.isfile(full_path):
+        raise Http404(path)
+    accepted = {
+        part.split(';')[0].strip()
+        for part in request.META.get('HTTP_ACCEPT_ENCODING', '').split(',')
+    }
+    encoding = None
+    # brotli, если есть, сжимает лучше gzip.
+    for name, (extension, _) in reversed(get_encoders().items()):
+        if name in accepted and os.path.isfile(full_path + extension):
+            encoding, full_path = name, full_path + extension
+            break
+    content_type, _ = mimetypes.guess_type(path)
+    response = FileResponse(
+        open(full_path, 'rb'),
+        content_type=content_type or 'application/octet-stream'
+    )
+    if encoding:
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ('Accept-Encoding', ))
+    if is_hashed(path):
+        patch_cache_control(
+            response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True
+        )
+    return response
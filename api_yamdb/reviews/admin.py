@@ -1,6 +1,38 @@
 from django.contrib import admin
 
-from .models import Category, Comment, CustomUser, Genre, Review, Title
+from .models import (
+    Category, Comment, CustomUser, Genre, OutgoingEmail, Review, Title
+)
+
+
+class RelatedQuerysetMixin:
+    '''
+    Варианты связей в формах берутся из get_queryset админки связанной
+    модели: её select_related и prefetch_related убирают N+1 в __str__.
+    '''
+
+    def get_field_queryset(self, db, db_field, request):
+        related_admin = self.admin_site._registry.get(
+            db_field.remote_field.model
+        )
+        if related_admin is None:
+            return super().get_field_queryset(db, db_field, request)
+        return related_admin.get_queryset(request).using(db)
+
+
+class RelatedChoicesFilter(admin.RelatedFieldListFilter):
+    '''Фильтр по связи с вариантами из get_queryset связанной админки.'''
+
+    def field_choices(self, field, request, model_admin):
+        related_admin = model_admin.admin_site._registry.get(
+            field.remote_field.model
+        )
+        if related_admin is None:
+            return super().field_choices(field, request, model_admin)
+        return [
+            (obj.pk, str(obj))
+            for obj in related_admin.get_queryset(request)
+        ]
 
 
 class TitleInline(admin.StackedInline):
@@ -39,7 +71,7 @@ class ReviewInLine(admin.StackedInline):
 
 
 @admin.register(Title)
-class TitleAdmin(admin.ModelAdmin):
+class TitleAdmin(RelatedQuerysetMixin, admin.ModelAdmin):
     list_display = (
         'name', 'year', 'category', 'display_genres', 'description'
     )
@@ -49,6 +81,19 @@ class TitleAdmin(admin.ModelAdmin):
     list_editable = ('category', )
     search_fields = ('name', )
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'category'
+        ).prefetch_related('genre')
+
+    def get_changelist_formset(self, request, **kwargs):
+        formset = super().get_changelist_formset(request, **kwargs)
+        # Формы строк list_editable копируют поле: без списка каждая
+        # строка загружает категории заново.
+        category = formset.form.base_fields['category']
+        category.choices = list(category.choices)
+        return formset
+
     def display_genres(self, obj):
         """Функция для отображения жанров в list_display."""
         return ", ".join([genre.name for genre in obj.genre.all()])
@@ -62,26 +107,45 @@ class CommentInLine(admin.StackedInline):
 
 
 @admin.register(Review)
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(RelatedQuerysetMixin, admin.ModelAdmin):
     list_display = (
         'text', 'author', 'title', 'score', 'pub_date'
     )
     inlines = (CommentInLine, )
-    list_filter = ('score', 'title')
+    list_filter = ('score', ('title', RelatedChoicesFilter))
     search_fields = ('text', )
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'author', 'title__category'
+        ).prefetch_related('title__genre')
+
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(RelatedQuerysetMixin, admin.ModelAdmin):
     list_display = (
         'text', 'author', 'review', 'pub_date'
     )
-    list_filter = ('review', )
+    list_filter = (('review', RelatedChoicesFilter), )
     search_fields = ('text', )
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'author', 'review__author', 'review__title'
+        )
+
 
 @admin.register(CustomUser)
 class CustomUserAdmin(admin.ModelAdmin):
     list_display = (
         'username', 'email', 'role'
     )
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'recipient', 'subject', 'send_after', 'attempts', 'sent_at'
+    )
+    list_filter = ('sent_at', )
+    search_fields = ('recipient', )
@@ -0,0 +1,138 @@
+import csv
+import io
+import json
+from datetime import datetime
+from itertools import islice
+
+from django.core.management import load_command_class
+
+from .models import Title
+
+# Набор данных -> команда импорта: её файл и колонки задают формат CSV.
+DATASETS = {
+    'users': 'csv1user',
+    'genres': 'csv2genre',
+    'categories': 'csv3category',
+    'titles': 'csv4title',
+    'genre_titles': 'csv5genretitle',
+    'reviews': 'csv6review',
+    'comments': 'csv7comment',
+}
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+DEFAULT_CHUNK_SIZE = 2000
+BUFFER_SIZE = 64 * 1024
+# Колонки произведений сверх импортируемых: импорт их пропускает.
+TITLE_EXTRA_COLUMNS = ('category_slug', 'description', 'rating', 'genres')
+
+
+def get_import_command(dataset):
+    return load_command_class('reviews', DATASETS[dataset])
+
+
+def get_file_name(dataset, file_format):
+    '''Имя файла CSV совпадает с тем, что читает команда импорта.'''
+    if file_format == 'csv':
+        return get_import_command(dataset).file_name
+    return f'{dataset}.{file_format}'
+
+
+def get_columns(dataset):
+    columns = list(get_import_command(dataset).columns.values())
+    if dataset == 'titles':
+        columns.extend(TITLE_EXTRA_COLUMNS)
+    return columns
+
+
+def chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def export_rows(dataset, chunk_size=DEFAULT_CHUNK_SIZE):
+    '''
+    Строки набора данных словарями колонка -> значение.
+
+    Строки читаются курсором пачками по chunk_size, поэтому память
+    не зависит от размера таблицы.
+    '''
+    command = get_import_command(dataset)
+    model = command.model
+    fields = [model._meta.get_field(name).attname for name in command.columns]
+    columns = list(command.columns.values())
+    if dataset == 'titles':
+        yield from export_titles(fields, columns, chunk_size)
+        return
+    queryset = model.objects.order_by('pk').values_list(*fields)
+    for values in queryset.iterator(chunk_size=chunk_size):
+        yield dict(zip(columns, values))
+
+
+def export_titles(fields, columns, chunk_size):
+    '''Произведения с категорией, рейтингом и жанрами одной пачкой.'''
+    queryset = Title.objects.order_by('pk').values_list(
+        *fields, 'category__slug', 'description', 'rating_sum',
+        'rating_count'
+    )
+    through = Title.genre.through
+    for chunk in chunks(queryset.iterator(chunk_size=chunk_size), chunk_size):
+        genres = {}
+        for title_id, slug in through.objects.filter(
+            title_id__in=[values[0] for values in chunk]
+        ).order_by('genre__slug').values_list('title_id', 'genre__slug'):
+            genres.setdefault(title_id, []).append(slug)
+        for values in chunk:
+            *values, slug, description, rating_sum, rating_count = values
+            row = dict(zip(columns, values))
+            row.update(
+                category_slug=slug, description=description,
+                rating=rating_sum / rating_count if rating_count else None,
+                genres=genres.get(row['id'], []),
+            )
+            yield row
+
+
+def format_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, list):
+        return ','.join(value)
+    return format_value(value)
+
+
+def stream(dataset, file_format, chunk_size=DEFAULT_CHUNK_SIZE):
+    '''Текст выгрузки кусками до BUFFER_SIZE символов.'''
+    rows = export_rows(dataset, chunk_size)
+    buffer = io.StringIO()
+    if file_format == 'ndjson':
+        def write(row):
+            buffer.write(json.dumps(
+                {key: format_value(value) for key, value in row.items()},
+                ensure_ascii=False
+            ) + '\n')
+    else:
+        columns = get_columns(dataset)
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+
+        def write(row):
+            writer.writerow([csv_value(row[column]) for column in columns])
+    for row in rows:
+        write(row)
+        if buffer.tell() >= BUFFER_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
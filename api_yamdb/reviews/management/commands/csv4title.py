@@ -1,21 +1,24 @@
-import csv
+from reviews.management.csv_import import CsvImportCommand
+from reviews.models import Title, TitleStats
+from reviews.search import get_search_index
 
-from django.core.management import BaseCommand
 
-from reviews.models import Title
-
-
-class Command(BaseCommand):
+class Command(CsvImportCommand):
     help = 'Добавление в модель Произведений данных из CSV'
+    model = Title
+    file_name = 'titles.csv'
+    columns = {
+        'id': 'id',
+        'name': 'name',
+        'year': 'year',
+        'category': 'category',
+    }
+    # В исходном titles.csv описания нет, в выгрузке export_data — есть.
+    optional_columns = {'description': 'description'}
 
-    def handle(self, *args, **kwargs):
-        file_path = 'static/data/titles.csv'
-        with open(file_path, 'r', encoding='utf8') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                Title.objects.get_or_create(
-                    id=row['id'],
-                    name=row['name'],
-                    year=row['year'],
-                    category_id=row['category'],
-                )
+    def after_batch(self, batch):
+        TitleStats.objects.bulk_create(
+            [TitleStats(title_id=title.pk) for title in batch],
+            ignore_conflicts=True
+        )
+        get_search_index().index_titles(batch)
@@ -1,18 +1,9 @@
-import csv
+from reviews.management.csv_import import CsvImportCommand
+from reviews.models import Title
 
-from django.core.management import BaseCommand
 
-from reviews.models import Genre, Title
-
-
-class Command(BaseCommand):
+class Command(CsvImportCommand):
     help = 'Добавление в модель Произведений связь с Жанрами из CSV'
-
-    def handle(self, *args, **kwargs):
-        file_path = 'static/data/genre_title.csv'
-        with open(file_path, 'r', encoding='utf8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                title = Title.objects.get(id=row['title_id'])
-                genre = Genre.objects.get(id=row['genre_id'])
-                title.genre.add(genre)
+    model = Title.genre.through
+    file_name = 'genre_title.csv'
+    columns = {'id': 'id', 'title': 'title_id', 'genre': 'genre_id'}
@@ -1,23 +1,28 @@
-import csv
+from reviews.management.csv_import import CsvImportCommand
+from reviews.models import Review, Title
+from reviews.search import get_search_index
+from reviews.signals import recount_ratings, recount_stats
 
-from django.core.management import BaseCommand
 
-from reviews.models import Review
-
-
-class Command(BaseCommand):
+class Command(CsvImportCommand):
     help = 'Добавление в модель Review данных из CSV'
+    model = Review
+    file_name = 'review.csv'
+    columns = {
+        'id': 'id',
+        'title': 'title_id',
+        'text': 'text',
+        'author': 'author',
+        'score': 'score',
+        'pub_date': 'pub_date',
+    }
 
-    def handle(self, *args, **kwargs):
-        file_path = 'static/data/review.csv'
-        with open(file_path, 'r', encoding='utf8') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                Review.objects.get_or_create(
-                    id=row['id'],
-                    title_id=row['title_id'],
-                    text=row['text'],
-                    author_id=row['author'],
-                    score=row['score'],
-                    pub_date=row['pub_date'],
-                )
+    def after_batch(self, batch):
+        # bulk_create не отправляет post_save, рейтинг и статистика
+        # считаются заново.
+        titles = Title.objects.filter(
+            pk__in={review.title_id for review in batch}
+        )
+        recount_ratings(titles)
+        recount_stats(titles)
+        get_search_index().index_reviews(batch)
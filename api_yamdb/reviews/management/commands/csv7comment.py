@@ -1,22 +1,21 @@
-import csv
+from reviews.management.csv_import import CsvImportCommand
+from reviews.models import Comment, Title
+from reviews.signals import recount_stats
 
-from django.core.management import BaseCommand
 
-from reviews.models import Comment
-
-
-class Command(BaseCommand):
+class Command(CsvImportCommand):
     help = 'Добавление в модель Комментария данных из CSV'
+    model = Comment
+    file_name = 'comments.csv'
+    columns = {
+        'id': 'id',
+        'text': 'text',
+        'pub_date': 'pub_date',
+        'author': 'author',
+        'review': 'review_id',
+    }
 
-    def handle(self, *args, **kwargs):
-        file_path = 'static/data/comments.csv'
-        with open(file_path, 'r', encoding='utf8') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                Comment.objects.get_or_create(
-                    id=row['id'],
-                    text=row['text'],
-                    pub_date=row['pub_date'],
-                    author_id=row['author'],
-                    review_id=row['review_id'],
-                )
+    def after_batch(self, batch):
+        recount_stats(Title.objects.filter(
+            reviews__in={comment.review_id for comment in batch}
+        ).distinct())
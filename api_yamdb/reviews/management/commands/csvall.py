@@ -1,19 +1,85 @@
-from django.core.management import BaseCommand, call_command
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
-COMMANDS = [
-    'csv1user',
-    'csv2genre',
-    'csv3category',
-    'csv4title',
-    'csv5genretitle',
-    'csv6review',
-    'csv7comment',
-]
+from django.core.management import CommandError, call_command
+from django.db import connections
 
+from reviews.management.csv_import import CsvImportCommand
 
-class Command(BaseCommand):
-    help = 'Импорт всех файлов csv'
+# Команда импорта -> команды, данные которых ей нужны.
+COMMANDS = {
+    'csv1user': (),
+    'csv2genre': (),
+    'csv3category': (),
+    'csv4title': ('csv3category', ),
+    'csv5genretitle': ('csv4title', 'csv2genre'),
+    'csv6review': ('csv4title', 'csv1user'),
+    'csv7comment': ('csv6review', 'csv1user'),
+}
+DEFAULT_WORKERS = 3
 
-    def handle(self, *args, **kwargs):
-        for command in COMMANDS:
-            call_command(command)
+
+class Command(CsvImportCommand):
+    help = 'Импорт всех файлов csv с параллельным запуском независимых этапов'
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--workers', type=int, default=DEFAULT_WORKERS,
+            help='Количество одновременно выполняемых этапов',
+        )
+
+    def run_stage(self, command, options):
+        started = time.monotonic()
+        try:
+            call_command(
+                command, path=options['path'],
+                batch_size=options['batch_size'], stdout=self.stdout,
+            )
+        finally:
+            # У каждого потока своё соединение с БД.
+            connections.close_all()
+        return time.monotonic() - started
+
+    def start_ready(self, pool, options):
+        for command, requires in list(self.pending.items()):
+            blocked = (self.failed | self.skipped).intersection(requires)
+            if blocked:
+                del self.pending[command]
+                self.skipped.add(command)
+                self.stderr.write(
+                    f'{command}: пропущен, не выполнены '
+                    f'{", ".join(sorted(blocked))}'
+                )
+            elif self.done.issuperset(requires):
+                del self.pending[command]
+                self.running[pool.submit(
+                    self.run_stage, command, options
+                )] = command
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1:
+            raise CommandError('--workers должен быть положительным')
+        self.pending = dict(COMMANDS)
+        self.running = {}
+        self.done, self.failed, self.skipped = set(), set(), set()
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            self.start_ready(pool, options)
+            while self.running:
+                finished, _ = wait(self.running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    command = self.running.pop(future)
+                    try:
+                        elapsed = future.result()
+                    except Exception as error:
+                        self.failed.add(command)
+                        self.stderr.write(f'{command}: ошибка: {error}')
+                    else:
+                        self.done.add(command)
+                        self.stdout.write(f'{command}: {elapsed:.2f} с')
+                self.start_ready(pool, options)
+        if self.failed or self.skipped:
+            raise CommandError(
+                'Импорт не завершён: ошибки в '
+                f'{", ".join(sorted(self.failed))}'
+            )
@@ -0,0 +1,61 @@
+from django.core.management import BaseCommand, CommandError
+from django.db import connection
+
+from reviews.sqlite import VACUUM_PAGES, page_statistics, read_pragma
+
+INCREMENTAL = 2
+
+
+class Command(BaseCommand):
+    help = (
+        'Обслуживание SQLite: ANALYZE, PRAGMA optimize и '
+        'инкрементальная очистка свободных страниц'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pages', type=int, default=VACUUM_PAGES,
+            help='Сколько свободных страниц вернуть файлу за запуск',
+        )
+        parser.add_argument(
+            '--enable-incremental', action='store_true',
+            help=(
+                'Включить auto_vacuum=INCREMENTAL; база перестраивается '
+                'полным VACUUM'
+            ),
+        )
+
+    def report(self, label, statistics):
+        self.stdout.write('{}: {} страниц по {} Б, свободных {}'.format(
+            label, statistics['page_count'], statistics['page_size'],
+            statistics['freelist_count']
+        ))
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Команда обслуживает только SQLite')
+        if options['pages'] < 0:
+            raise CommandError('--pages не может быть отрицательным')
+        with connection.cursor() as cursor:
+            before = page_statistics(cursor)
+            self.report('До', before)
+            cursor.execute('ANALYZE')
+            cursor.execute('PRAGMA optimize')
+            if options['enable_incremental']:
+                cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+                cursor.execute('VACUUM')
+            if read_pragma(cursor, 'auto_vacuum') == INCREMENTAL:
+                cursor.execute(
+                    f'PRAGMA incremental_vacuum({options["pages"]})'
+                )
+                cursor.fetchall()
+            else:
+                self.stdout.write(
+                    'auto_vacuum выключен, свободные страницы остаются в '
+                    'файле: запустите с --enable-incremental'
+                )
+            after = page_statistics(cursor)
+        self.report('После', after)
+        self.stdout.write('Освобождено страниц: {}'.format(
+            before['page_count'] - after['page_count']
+        ))
@@ -0,0 +1,56 @@
+import time
+from pathlib import Path
+
+from django.core.management import BaseCommand, CommandError
+
+from reviews.export import (
+    DATASETS, DEFAULT_CHUNK_SIZE, FORMATS, get_file_name, stream
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоковая выгрузка данных в CSV (формат команд импорта csv*) '
+        'или NDJSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'datasets', nargs='*',
+            help=f'Наборы данных ({", ".join(DATASETS)}), по умолчанию все',
+        )
+        parser.add_argument(
+            '--format', choices=FORMATS, default='csv', dest='file_format',
+            help='Формат файлов',
+        )
+        parser.add_argument(
+            '--path', type=Path, default=Path('.'),
+            help='Каталог для файлов',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+            help='Количество строк, читаемых из БД за раз',
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size должен быть положительным')
+        unknown = set(options['datasets']) - set(DATASETS)
+        if unknown:
+            raise CommandError(
+                f'Нет наборов данных {", ".join(sorted(unknown))}'
+            )
+        options['path'].mkdir(parents=True, exist_ok=True)
+        for dataset in options['datasets'] or DATASETS:
+            started = time.monotonic()
+            file_path = options['path'] / get_file_name(
+                dataset, options['file_format']
+            )
+            with open(file_path, 'w', encoding='utf8', newline='') as file:
+                for text in stream(
+                    dataset, options['file_format'], options['chunk_size']
+                ):
+                    file.write(text)
+            self.stdout.write(
+                f'{file_path}: {time.monotonic() - started:.2f} с'
+            )
@@ -0,0 +1,235 @@
+import random
+import time
+from datetime import timedelta
+from itertools import islice
+
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from reviews.models import (
+    ADMIN, MAX_SCORE, MIN_SCORE, MODERATOR, USER, Category, Comment,
+    CustomUser, Genre, Review, Title
+)
+from reviews.signals import recount_ratings, recount_stats
+from reviews.versions import bump_version
+
+DEFAULT_BATCH_SIZE = 10000
+ROLE_WEIGHTS = {USER: 95, MODERATOR: 4, ADMIN: 1}
+# Оценки смещены к высоким, как в живых каталогах.
+SCORE_WEIGHTS = (2, 1, 2, 3, 5, 8, 12, 16, 14, 10)
+DAYS = 3 * 365
+
+
+def zipf_counts(total, size, exponent, cap):
+    '''
+    Раскладывает total по size корзинам с весами 1 / rank ** exponent,
+    не больше cap в корзине; остаток от округления — самым частым.
+    '''
+    if total > size * cap:
+        raise CommandError(f'{total} не помещается в {size} × {cap}')
+    weights = [1 / rank ** exponent for rank in range(1, size + 1)]
+    scale = total / sum(weights)
+    counts = [min(cap, int(weight * scale)) for weight in weights]
+    left = total - sum(counts)
+    while left:
+        open_ranks = [rank for rank in range(size) if counts[rank] < cap]
+        share = max(1, left // len(open_ranks))
+        for rank in open_ranks:
+            added = min(share, cap - counts[rank], left)
+            counts[rank] += added
+            left -= added
+            if not left:
+                break
+    return counts
+
+
+def review_date(review_id, now):
+    '''Дата отзыва — хэш id: комментарии находят её без хранения дат.'''
+    fraction = (review_id * 2654435761) % 2 ** 32 / 2 ** 32
+    return now - timedelta(days=DAYS) * fraction
+
+
+def next_id(model):
+    return (model.objects.aggregate(top=Max('pk'))['top'] or 0) + 1
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерация синтетических данных со смещёнными распределениями '
+        'для нагрузочного тестирования'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--genres', type=int, default=50)
+        parser.add_argument('--titles', type=int, default=10000)
+        parser.add_argument('--reviews', type=int, default=100000)
+        parser.add_argument('--comments', type=int, default=20000)
+        parser.add_argument(
+            '--max-genres', type=int, default=5,
+            help='Наибольшее количество жанров у произведения',
+        )
+        parser.add_argument(
+            '--zipf', type=float, default=1.1,
+            help='Показатель распределения Ципфа для отзывов и комментариев',
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Зерно генератора: один seed — одни и те же данные',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help='Количество строк в одной транзакции',
+        )
+
+    def insert(self, model, objects):
+        '''Пишет объекты пачками, не собирая генератор в список.'''
+        started = time.monotonic()
+        inserted = 0
+        objects = iter(objects)
+        while True:
+            batch = list(islice(objects, self.batch_size))
+            if not batch:
+                break
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+            inserted += len(batch)
+        bump_version(model)
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f'{model._meta.verbose_name_plural}: {inserted} строк за '
+            f'{elapsed:.2f} с'
+        )
+
+    def random_date(self, after=None):
+        start = after or self.now - timedelta(days=DAYS)
+        return start + (self.now - start) * self.rng.random()
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть положительным')
+        if options['comments'] and not options['reviews']:
+            raise CommandError('Комментариям нужны отзывы')
+        self.rng = random.Random(options['seed'])
+        self.now = timezone.now()
+        self.batch_size = options['batch_size']
+        users = self.generate_users(options['users'])
+        categories = self.generate_named(Category, options['categories'])
+        genres = self.generate_named(Genre, options['genres'])
+        titles = self.generate_titles(
+            options['titles'], categories, genres, options['max_genres']
+        )
+        reviews = self.generate_reviews(
+            options['reviews'], titles, users, options['zipf']
+        )
+        self.generate_comments(
+            options['comments'], reviews, users, options['zipf']
+        )
+        generated = Title.objects.filter(
+            pk__gte=titles.start, pk__lt=titles.stop
+        )
+        recount_ratings(generated)
+        recount_stats(generated)
+        self.stdout.write(
+            'Поисковый индекс обновляется командой rebuild_search_index'
+        )
+
+    def generate_users(self, size):
+        start = next_id(CustomUser)
+        ids = range(start, start + size)
+        self.insert(CustomUser, (
+            CustomUser(
+                id=idx, username=f'user{idx}', email=f'user{idx}@yamdb.fake',
+                role=self.rng.choices(
+                    list(ROLE_WEIGHTS), list(ROLE_WEIGHTS.values())
+                )[0]
+            )
+            for idx in ids
+        ))
+        return ids
+
+    def generate_named(self, model, size):
+        start = next_id(model)
+        ids = range(start, start + size)
+        self.insert(model, (
+            model(
+                id=idx, name=f'{model._meta.verbose_name} {idx}',
+                slug=f'{model._meta.model_name}-{idx}'
+            )
+            for idx in ids
+        ))
+        return ids
+
+    def generate_titles(self, size, categories, genres, max_genres):
+        start = next_id(Title)
+        ids = range(start, start + size)
+        self.insert(Title, (
+            Title(
+                id=idx, name=f'Произведение {idx}',
+                year=self.rng.randint(1900, self.now.year),
+                category_id=self.rng.choice(categories),
+                description=f'Описание произведения {idx}'
+            )
+            for idx in ids
+        ))
+        # Популярные жанры встречаются чаще: вес жанра — 1 / ранг.
+        weights = [1 / rank for rank in range(1, len(genres) + 1)]
+        through = Title.genre.through
+        self.insert(through, (
+            through(title_id=idx, genre_id=genre_id)
+            for idx in ids
+            for genre_id in set(self.rng.choices(
+                genres, weights, k=self.rng.randint(1, max_genres)
+            ))
+        ))
+        return ids
+
+    def generate_reviews(self, size, titles, users, exponent):
+        '''Отзывы по произведениям по Ципфу; автор на произведение один.'''
+        popular = list(titles)
+        self.rng.shuffle(popular)
+        counts = zipf_counts(size, len(popular), exponent, len(users))
+        start = next_id(Review)
+        self.insert(Review, (
+            Review(
+                id=idx, title_id=title_id, author_id=author_id,
+                text=f'Отзыв {idx}', pub_date=review_date(idx, self.now),
+                score=self.rng.choices(
+                    range(MIN_SCORE, MAX_SCORE + 1), SCORE_WEIGHTS
+                )[0]
+            )
+            for idx, (title_id, author_id) in enumerate((
+                (title_id, author_id)
+                for title_id, count in zip(popular, counts)
+                for author_id in self.rng.sample(users, count)
+            ), start)
+        ))
+        return range(start, start + size)
+
+    def generate_comments(self, size, reviews, users, exponent):
+        '''
+        Обсуждения: комментарии по отзывам по Ципфу, в ветке
+        переписываются несколько участников, даты растут.
+        '''
+        popular = list(reviews)
+        self.rng.shuffle(popular)
+        counts = zipf_counts(size, len(popular), exponent, size)
+        self.insert(Comment, (
+            comment
+            for review_id, count in zip(popular, counts) if count
+            for comment in self.thread(review_id, count, users)
+        ))
+
+    def thread(self, review_id, size, users):
+        participants = self.rng.sample(users, min(len(users), 3))
+        pub_date = review_date(review_id, self.now)
+        for position in range(size):
+            pub_date = self.random_date(after=pub_date)
+            yield Comment(
+                review_id=review_id,
+                author_id=participants[position % len(participants)],
+                text=f'Комментарий {position + 1}', pub_date=pub_date
+            )
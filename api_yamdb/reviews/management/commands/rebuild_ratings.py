@@ -0,0 +1,46 @@
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+
+from reviews.models import Title
+from reviews.signals import recount_ratings
+from reviews.versions import bump_version
+
+
+class Command(BaseCommand):
+    help = 'Пересчёт и проверка хранимого рейтинга произведений по отзывам'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Только проверить рейтинг, не исправляя расхождения',
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            drifted = list(
+                Title.objects.annotate(
+                    actual_sum=Coalesce(Sum('reviews__score'), 0),
+                    actual_count=Count('reviews'),
+                ).filter(
+                    ~Q(rating_sum=F('actual_sum'))
+                    | ~Q(rating_count=F('actual_count'))
+                ).values_list('pk', flat=True)
+            )
+            if drifted and not options['check']:
+                recount_ratings(Title.objects.filter(pk__in=drifted))
+                # update() не отправляет сигналы: кэш списков и ETag
+                # сбрасываются вручную, когда пересчёт уже виден.
+                transaction.on_commit(lambda: bump_version(Title))
+        if not drifted:
+            self.stdout.write('Рейтинг всех произведений актуален')
+        elif options['check']:
+            raise CommandError(
+                f'Рейтинг расходится с отзывами у {len(drifted)} '
+                'произведений'
+            )
+        else:
+            self.stdout.write(
+                f'Рейтинг пересчитан у {len(drifted)} произведений'
+            )
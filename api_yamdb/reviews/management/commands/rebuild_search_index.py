@@ -0,0 +1,24 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from reviews.search import get_search_index
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = 'Перестроение поискового индекса произведений и отзывов'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help='Количество документов, индексируемых за раз',
+        )
+
+    def handle(self, *args, **options):
+        index = get_search_index()
+        with transaction.atomic():
+            index.rebuild(options['batch_size'])
+        self.stdout.write(
+            f'Поисковый индекс перестроен ({type(index).__name__})'
+        )
@@ -0,0 +1,53 @@
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+
+from reviews.models import Title, TitleStats
+from reviews.signals import recount_stats, stats_expressions
+from reviews.versions import bump_version
+
+
+class Command(BaseCommand):
+    help = 'Пересчёт и проверка статистики произведений по отзывам'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Только проверить статистику, не исправляя расхождения',
+        )
+
+    def get_drifted(self):
+        expressions = stats_expressions()
+        drifted = set(
+            Title.objects.filter(stats__isnull=True).values_list(
+                'pk', flat=True
+            )
+        )
+        for stats in TitleStats.objects.annotate(**{
+            f'actual_{name}': expression
+            for name, expression in expressions.items()
+        }).values().iterator():
+            if any(
+                stats[name] != stats[f'actual_{name}'] for name in expressions
+            ):
+                drifted.add(stats['title_id'])
+        return drifted
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            drifted = self.get_drifted()
+            if drifted and not options['check']:
+                recount_stats(Title.objects.filter(pk__in=drifted))
+                # update() не отправляет сигналы: кэш списков и ETag
+                # сбрасываются вручную, когда пересчёт уже виден.
+                transaction.on_commit(lambda: bump_version(TitleStats))
+        if not drifted:
+            self.stdout.write('Статистика всех произведений актуальна')
+        elif options['check']:
+            raise CommandError(
+                f'Статистика расходится с отзывами у {len(drifted)} '
+                'произведений'
+            )
+        else:
+            self.stdout.write(
+                f'Статистика пересчитана у {len(drifted)} произведений'
+            )
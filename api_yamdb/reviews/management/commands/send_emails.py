@@ -0,0 +1,99 @@
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management import BaseCommand, CommandError
+from django.utils import timezone
+
+from reviews.models import OutgoingEmail
+
+
+class Command(BaseCommand):
+    help = 'Отправка писем из очереди через одно соединение с почтой'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help='Количество писем, выбираемых из очереди за раз',
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а проверять очередь каждые --interval с',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Пауза между проверками очереди в режиме --loop, с',
+        )
+
+    def claim(self, emails, now):
+        '''
+        Письма, занятые этим процессом до отправки.
+
+        Занятие сдвигает send_after на EMAIL_OUTBOX_LEASE, если его
+        не изменил другой процесс; упавший процесс вернёт письма
+        в очередь по истечении этого срока.
+        '''
+        lease = now + settings.EMAIL_OUTBOX_LEASE
+        return [
+            email for email in emails
+            if OutgoingEmail.objects.filter(
+                pk=email.pk, send_after=email.send_after,
+                sent_at__isnull=True,
+            ).update(send_after=lease)
+        ]
+
+    def send_batch(self, connection, batch_size):
+        now = timezone.now()
+        emails = self.claim(OutgoingEmail.objects.filter(
+            sent_at__isnull=True,
+            send_after__lte=now,
+            attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        )[:batch_size], now)
+        for email in emails:
+            try:
+                connection.send_messages([email.as_message()])
+            except Exception as error:
+                email.attempts += 1
+                email.last_error = str(error)
+                email.send_after = now + (
+                    settings.EMAIL_OUTBOX_RETRY_DELAY
+                    * 2 ** (email.attempts - 1)
+                )
+            else:
+                email.sent_at = now
+        OutgoingEmail.objects.bulk_update(
+            emails, ('attempts', 'last_error', 'send_after', 'sent_at')
+        )
+        return emails
+
+    def drain(self, batch_size):
+        sent = failed = 0
+        with get_connection() as connection:
+            while True:
+                emails = self.send_batch(connection, batch_size)
+                sent += sum(email.sent_at is not None for email in emails)
+                failed += sum(email.sent_at is None for email in emails)
+                # Письма, занятые другим процессом, не попадают в пачку.
+                if not emails:
+                    return sent, failed
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                sent, failed = self.drain(options['batch_size'])
+            except OSError as error:
+                # Соединение не открылось до выбора писем: попытки
+                # отправки не тратятся, очередь ждёт следующего прохода.
+                message = f'Нет соединения с почтой: {error}'
+                if not options['loop']:
+                    raise CommandError(message)
+                self.stderr.write(message)
+            else:
+                if sent or failed or not options['loop']:
+                    self.stdout.write(
+                        f'Отправлено писем: {sent}, отложено: {failed}'
+                    )
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,30 @@
+# Generated by Django 3.2 on 2026-10-18 17:48
+
+from django.db import migrations, models
+import django.db.models.functions.comparison
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_customuser_token_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(django.db.models.functions.comparison.Collate('slug', 'NOCASE'), name='category_slug_nocase_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(django.db.models.functions.comparison.Collate('username', 'NOCASE'), name='user_username_nocase_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='genre',
+            index=models.Index(django.db.models.functions.comparison.Collate('slug', 'NOCASE'), name='genre_slug_nocase_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(django.db.models.functions.comparison.Collate('name', 'NOCASE'), name='title_name_nocase_idx'),
+        ),
+    ]
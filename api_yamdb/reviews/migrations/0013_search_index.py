@@ -0,0 +1,57 @@
+# Generated by Django 3.2 on 2026-10-18 17:50
+
+from django.db import OperationalError, migrations, models, transaction
+import django.db.models.deletion
+
+
+def create_fts_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute(
+                'CREATE VIRTUAL TABLE reviews_title_fts '
+                'USING fts5(name, description)'
+            )
+            schema_editor.execute(
+                'CREATE VIRTUAL TABLE reviews_review_fts '
+                'USING fts5(text, title_id UNINDEXED)'
+            )
+    except OperationalError:
+        # SQLite собран без FTS5: поиск работает по таблице SearchTerm.
+        pass
+
+
+def drop_fts_tables(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS reviews_title_fts')
+        schema_editor.execute('DROP TABLE IF EXISTS reviews_review_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0012_nocase_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, verbose_name='Слово')),
+                ('weight', models.PositiveIntegerField(verbose_name='Вес')),
+                ('review', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='reviews.review', verbose_name='Отзыв произведения')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Слово поискового индекса',
+                'verbose_name_plural': 'Слова поискового индекса',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='searchterm',
+            index=models.Index(fields=['term', 'title'], name='search_term_idx'),
+        ),
+        migrations.RunPython(create_fts_tables, drop_fts_tables),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 3.2 on 2026-10-18 17:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_title_stats(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    TitleStats = apps.get_model('reviews', 'TitleStats')
+    Review = apps.get_model('reviews', 'Review')
+    Comment = apps.get_model('reviews', 'Comment')
+    TitleStats.objects.bulk_create(
+        TitleStats(title_id=pk)
+        for pk in Title.objects.values_list('pk', flat=True).iterator()
+    )
+    reviews = Review.objects.filter(
+        title=OuterRef('title')
+    ).order_by().values('title')
+    comments = Comment.objects.filter(
+        review__title=OuterRef('title')
+    ).order_by().values('review__title')
+
+    def count(queryset):
+        return Coalesce(Subquery(
+            queryset.annotate(total=Count('pk')).values('total')
+        ), 0)
+
+    TitleStats.objects.update(
+        review_count=count(reviews),
+        comment_count=count(comments),
+        last_review_date=Subquery(
+            reviews.order_by('-pub_date').values('pub_date')[:1]
+        ),
+        **{
+            f'score_{score}': count(reviews.filter(score=score))
+            for score in range(1, 11)
+        }
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0013_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleStats',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='reviews.title', verbose_name='Произведение')),
+                ('score_1', models.PositiveIntegerField(default=0, editable=False, verbose_name='Оценок «1»')),
+                ('score_2', models.PositiveIntegerField(default=0, editable=False, verbose_name='Оценок «2»')),
+                ('score_3', models.PositiveIntegerField(default=0, editable=False, verbose_name='Оценок «3»')),
+                ('score_4', models.PositiveIntegerField(default=0, editable=False, verbose_name='Оценок «4»')),
+                ('score_5', models.PositiveIntegerField(default=0, editable=False, verbose_name='Оценок «5»')),
+                ('score_6', models.PositiveIntegerField(default=0, editable=False, verbose_name='Оценок «6»')),
+                ('score_7', models.PositiveIntegerField(default=0, editable=False, verbose_name='Оценок «7»')),
+                ('score_8', models.PositiveIntegerField(default=0, editable=False, verbose_name='Оценок «8»')),
+                ('score_9', models.PositiveIntegerField(default=0, editable=False, verbose_name='Оценок «9»')),
+                ('score_10', models.PositiveIntegerField(default=0, editable=False, verbose_name='Оценок «10»')),
+                ('review_count', models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество отзывов')),
+                ('comment_count', models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество комментариев')),
+                ('last_review_date', models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Дата последнего отзыва')),
+            ],
+            options={
+                'verbose_name': 'Статистика произведения',
+                'verbose_name_plural': 'Статистика произведений',
+            },
+        ),
+        migrations.RunPython(fill_title_stats, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,11 @@
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
+from django.core.cache import cache
+from django.core.mail import EmailMessage
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Collate
+from django.utils import timezone
 
 from .validators import validate_username, validate_year
 
@@ -21,6 +25,13 @@ MAX_LENGTH_NAME_TITLE = 256
 MAX_LENGTH_TEXT = 256
 MIN_SCORE = 1
 MAX_SCORE = 10
+MAX_LENGTH_TERM = 64
+# Поля пользователя, которые попадают в JWT-токен.
+TOKEN_CLAIMS = ('role', 'is_staff', 'is_active')
+TOKEN_VERSION_CACHE_KEY = 'token_version:{}'
+# Регистронезависимое сравнение SQLite: индексы с ним работают для iexact
+# (LIKE без ведущего %).
+NOCASE = 'NOCASE'
 
 
 class CustomUser(AbstractUser):
@@ -44,15 +55,62 @@ class CustomUser(AbstractUser):
         max_length=settings.MAX_LENGTH_CODE, blank=True, null=True,
         editable=False, verbose_name='Код подтверждения'
     )
+    token_version = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Версия токенов'
+    )
+    # Значения TOKEN_CLAIMS на момент загрузки из БД.
+    loaded_claims = None
 
     class Meta:
         ordering = ('username', )
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
+        indexes = [
+            models.Index(
+                Collate('username', NOCASE), name='user_username_nocase_idx'
+            ),
+        ]
 
     def __str__(self):
         return f'{self.username} ({self.role})'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_claims = instance.get_claims()
+        return instance
+
+    def get_claims(self):
+        '''Значения TOKEN_CLAIMS или None, если часть из них не загружена.'''
+        if not set(TOKEN_CLAIMS) <= self.__dict__.keys():
+            return None
+        return tuple(self.__dict__[name] for name in TOKEN_CLAIMS)
+
+    def refresh_from_db(self, using=None, fields=None):
+        # Пользователь из токена при первом обращении к отложенному полю
+        # загружается целиком, а не по одному полю за запрос.
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred.issuperset(fields):
+            fields = deferred
+        super().refresh_from_db(using, fields)
+
+    def save(self, *args, **kwargs):
+        claims_changed = (
+            self.loaded_claims is not None
+            and self.loaded_claims != self.get_claims()
+        )
+        if claims_changed:
+            # Старые токены несут прежние роль и права и перестают работать.
+            self.token_version += 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {
+                    *kwargs['update_fields'], 'token_version'
+                }
+        super().save(*args, **kwargs)
+        if claims_changed:
+            cache.delete(TOKEN_VERSION_CACHE_KEY.format(self.pk))
+        self.loaded_claims = self.get_claims()
+
     def is_admin(self):
         return self.role == ADMIN or self.is_staff
 
@@ -83,6 +141,11 @@ class Category(BaseSlugModel):
     class Meta(BaseSlugModel.Meta):
         verbose_name = 'Категория'
         verbose_name_plural = 'Категории'
+        indexes = [
+            models.Index(
+                Collate('slug', NOCASE), name='category_slug_nocase_idx'
+            ),
+        ]
 
 
 class Genre(BaseSlugModel):
@@ -90,6 +153,11 @@ class Genre(BaseSlugModel):
     class Meta(BaseSlugModel.Meta):
         verbose_name = 'Жанр'
         verbose_name_plural = 'Жанры'
+        indexes = [
+            models.Index(
+                Collate('slug', NOCASE), name='genre_slug_nocase_idx'
+            ),
+        ]
 
 
 class Title(models.Model):
@@ -111,11 +179,30 @@ class Title(models.Model):
     description = models.TextField(
         blank=True, default='', verbose_name='Описание'
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Сумма оценок'
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Количество оценок'
+    )
 
     class Meta:
         ordering = ('name', )
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(fields=['name', 'id'], name='title_name_id_idx'),
+            models.Index(
+                Collate('name', NOCASE), name='title_name_nocase_idx'
+            ),
+        ]
+
+    @property
+    def rating(self):
+        '''Средняя оценка по хранимым сумме и количеству оценок.'''
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
 
     def __str__(self):
         genres = ', '.join(genre.slug for genre in self.genre.all())
@@ -125,12 +212,16 @@ class Title(models.Model):
 
 class BaseTextAuthorModel(models.Model):
     '''Базовая модель для Отзыва и Комментария'''
-    text = models.CharField(max_length=MAX_LENGTH_TEXT, verbose_name='Текст')
+    # Без ограничения в БД: в исходном review.csv есть тексты длиннее
+    # MAX_LENGTH_TEXT. Через API длина ограничена сериализаторами.
+    text = models.TextField(verbose_name='Текст')
     author = models.ForeignKey(
         CustomUser, on_delete=models.CASCADE, verbose_name='Автор'
     )
+    # Не auto_now: bulk_create импорта сохраняет дату из данных,
+    # а save() сдвигает её, как auto_now.
     pub_date = models.DateTimeField(
-        auto_now=True,
+        default=timezone.now, editable=False, blank=True,
         verbose_name='Дата публикации'
     )
 
@@ -143,6 +234,10 @@ class BaseTextAuthorModel(models.Model):
         return (f'{self.text[:20]} || {self.author.username[:20]} || '
                 f'{self.pub_date:%Y-%m-%d %H:%M:%S}')
 
+    def save(self, *args, **kwargs):
+        self.pub_date = timezone.now()
+        super().save(*args, **kwargs)
+
 
 class Review(BaseTextAuthorModel):
     '''Модель Отзыва'''
@@ -161,6 +256,9 @@ class Review(BaseTextAuthorModel):
         Title, on_delete=models.CASCADE, verbose_name='Произведение'
     )
 
+    # (title_id, score), уже учтённые в рейтинге произведения.
+    rated = None
+
     class Meta(BaseTextAuthorModel.Meta):
         verbose_name = 'Отзыв произведения'
         verbose_name_plural = 'Отзывы произведений'
@@ -170,10 +268,28 @@ class Review(BaseTextAuthorModel):
                 name='unique_author_title'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return super().__str__() + f'|| {self.title.name[:20]} || {self.score}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if {'title_id', 'score'} <= instance.__dict__.keys():
+            instance.rated = (instance.title_id, instance.score)
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Рейтинг произведения обновляется в post_save той же транзакцией.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class Comment(BaseTextAuthorModel):
     '''Модель комментария'''
@@ -184,6 +300,135 @@ class Comment(BaseTextAuthorModel):
     class Meta(BaseTextAuthorModel.Meta):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date', 'id'],
+                name='comment_review_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return super().__str__() + f' || {self.review.text[:20]}'
+
+
+def score_field(score):
+    '''Имя поля TitleStats с количеством оценок score.'''
+    return f'score_{score}'
+
+
+def score_count_field(score):
+    return models.PositiveIntegerField(
+        default=0, editable=False, verbose_name=f'Оценок «{score}»'
+    )
+
+
+class TitleStats(models.Model):
+    '''Агрегаты отзывов и комментариев произведения'''
+    title = models.OneToOneField(
+        Title, on_delete=models.CASCADE, primary_key=True,
+        related_name='stats', verbose_name='Произведение'
+    )
+    score_1 = score_count_field(1)
+    score_2 = score_count_field(2)
+    score_3 = score_count_field(3)
+    score_4 = score_count_field(4)
+    score_5 = score_count_field(5)
+    score_6 = score_count_field(6)
+    score_7 = score_count_field(7)
+    score_8 = score_count_field(8)
+    score_9 = score_count_field(9)
+    score_10 = score_count_field(10)
+    review_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Количество отзывов'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Количество комментариев'
+    )
+    last_review_date = models.DateTimeField(
+        blank=True, null=True, editable=False,
+        verbose_name='Дата последнего отзыва'
+    )
+
+    class Meta:
+        verbose_name = 'Статистика произведения'
+        verbose_name_plural = 'Статистика произведений'
+
+    def __str__(self):
+        return (f'{self.title_id} || {self.review_count} || '
+                f'{self.comment_count}')
+
+    @property
+    def scores(self):
+        '''Количество отзывов по каждой оценке.'''
+        return {
+            score: getattr(self, score_field(score))
+            for score in range(MIN_SCORE, MAX_SCORE + 1)
+        }
+
+
+class SearchTerm(models.Model):
+    '''Слово обратного индекса поиска для БД без FTS5'''
+    term = models.CharField(max_length=MAX_LENGTH_TERM, verbose_name='Слово')
+    title = models.ForeignKey(
+        Title, on_delete=models.CASCADE, related_name='search_terms',
+        verbose_name='Произведение'
+    )
+    review = models.ForeignKey(
+        Review, on_delete=models.CASCADE, related_name='search_terms',
+        blank=True, null=True, verbose_name='Отзыв произведения'
+    )
+    weight = models.PositiveIntegerField(verbose_name='Вес')
+
+    class Meta:
+        verbose_name = 'Слово поискового индекса'
+        verbose_name_plural = 'Слова поискового индекса'
+        indexes = [
+            models.Index(fields=['term', 'title'], name='search_term_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.term} || {self.title_id} || {self.weight}'
+
+
+class OutgoingEmail(models.Model):
+    '''Письмо в очереди на отправку'''
+    subject = models.CharField(max_length=MAX_LENGTH_NAME, verbose_name='Тема')
+    body = models.TextField(verbose_name='Текст')
+    from_email = models.EmailField(
+        max_length=MAX_LENGTH_EMAIL, verbose_name='Отправитель'
+    )
+    recipient = models.EmailField(
+        max_length=MAX_LENGTH_EMAIL, verbose_name='Получатель'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name='Дата создания'
+    )
+    send_after = models.DateTimeField(
+        default=timezone.now, verbose_name='Отправить после'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name='Попыток отправки'
+    )
+    sent_at = models.DateTimeField(
+        blank=True, null=True, verbose_name='Дата отправки'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+
+    class Meta:
+        ordering = ('send_after', )
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = [
+            models.Index(
+                fields=['sent_at', 'send_after'],
+                name='outgoing_email_queue_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient} || {self.subject[:20]} || {self.attempts}'
+
+    def as_message(self):
+        return EmailMessage(
+            self.subject, self.body, self.from_email, [self.recipient]
+        )
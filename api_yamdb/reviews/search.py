@@ -0,0 +1,211 @@
+import re
+from abc import ABC, abstractmethod
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, Sum
+
+from .models import MAX_LENGTH_TERM, Review, SearchTerm, Title
+
+TOKEN_PATTERN = re.compile(r'\w+')
+TITLE_FTS_TABLE = 'reviews_title_fts'
+REVIEW_FTS_TABLE = 'reviews_review_fts'
+# Вес совпадения в названии, описании и тексте отзыва.
+NAME_WEIGHT = 10
+DESCRIPTION_WEIGHT = 2
+TEXT_WEIGHT = 1
+
+
+def tokenize(text):
+    return [
+        token for token in TOKEN_PATTERN.findall(text.lower())
+        if len(token) <= MAX_LENGTH_TERM
+    ]
+
+
+class SearchIndex(ABC):
+    '''
+    Поисковый индекс по произведениям и отзывам.
+
+    Документы — произведение (название и описание) и каждый отзыв.
+    Документ находится, если содержит все слова запроса; очки
+    найденных документов суммируются по произведению.
+    '''
+
+    @abstractmethod
+    def index_titles(self, titles):
+        '''Добавляет или обновляет произведения в индексе.'''
+
+    @abstractmethod
+    def index_reviews(self, reviews):
+        '''Добавляет или обновляет отзывы в индексе.'''
+
+    @abstractmethod
+    def remove_titles(self, title_ids):
+        '''Убирает произведения из индекса.'''
+
+    @abstractmethod
+    def remove_reviews(self, review_ids):
+        '''Убирает отзывы из индекса.'''
+
+    @abstractmethod
+    def search(self, tokens, limit):
+        '''Id произведений по убыванию релевантности.'''
+
+    @abstractmethod
+    def clear(self):
+        '''Удаляет из индекса все документы.'''
+
+    def rebuild(self, batch_size):
+        self.clear()
+        titles = Title.objects.only('name', 'description').order_by()
+        reviews = Review.objects.only('title', 'text').order_by()
+        for queryset, index in (
+            (titles, self.index_titles), (reviews, self.index_reviews)
+        ):
+            batch = []
+            for obj in queryset.iterator(chunk_size=batch_size):
+                batch.append(obj)
+                if len(batch) == batch_size:
+                    index(batch)
+                    batch = []
+            index(batch)
+
+
+class Fts5SearchIndex(SearchIndex):
+    '''Индекс на виртуальных таблицах SQLite FTS5.'''
+
+    def execute_many(self, sql, params):
+        params = list(params)
+        if params:
+            with connection.cursor() as cursor:
+                cursor.executemany(sql, params)
+
+    def index_titles(self, titles):
+        titles = list(titles)
+        self.remove_titles(title.pk for title in titles)
+        self.execute_many(
+            f'INSERT INTO {TITLE_FTS_TABLE} (rowid, name, description) '
+            'VALUES (%s, %s, %s)',
+            ((title.pk, title.name, title.description) for title in titles)
+        )
+
+    def index_reviews(self, reviews):
+        reviews = list(reviews)
+        self.remove_reviews(review.pk for review in reviews)
+        self.execute_many(
+            f'INSERT INTO {REVIEW_FTS_TABLE} (rowid, text, title_id) '
+            'VALUES (%s, %s, %s)',
+            ((review.pk, review.text, review.title_id) for review in reviews)
+        )
+
+    def remove_titles(self, title_ids):
+        self.execute_many(
+            f'DELETE FROM {TITLE_FTS_TABLE} WHERE rowid = %s',
+            ((title_id, ) for title_id in title_ids)
+        )
+
+    def remove_reviews(self, review_ids):
+        self.execute_many(
+            f'DELETE FROM {REVIEW_FTS_TABLE} WHERE rowid = %s',
+            ((review_id, ) for review_id in review_ids)
+        )
+
+    def search(self, tokens, limit):
+        match = ' '.join(f'"{token}"' for token in tokens)
+        with connection.cursor() as cursor:
+            # bm25 тем меньше, чем документ релевантнее.
+            cursor.execute(
+                'SELECT title_id FROM ('
+                f'SELECT rowid AS title_id, -bm25({TITLE_FTS_TABLE}, '
+                f'{NAME_WEIGHT}, {DESCRIPTION_WEIGHT}) AS score '
+                f'FROM {TITLE_FTS_TABLE} WHERE {TITLE_FTS_TABLE} MATCH %s '
+                'UNION ALL '
+                'SELECT CAST(title_id AS INTEGER), '
+                f'-{TEXT_WEIGHT} * bm25({REVIEW_FTS_TABLE}) '
+                f'FROM {REVIEW_FTS_TABLE} WHERE {REVIEW_FTS_TABLE} MATCH %s'
+                ') GROUP BY title_id ORDER BY SUM(score) DESC, title_id '
+                'LIMIT %s',
+                (match, match, limit)
+            )
+            return [title_id for title_id, in cursor.fetchall()]
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {TITLE_FTS_TABLE}')
+            cursor.execute(f'DELETE FROM {REVIEW_FTS_TABLE}')
+
+
+class TermSearchIndex(SearchIndex):
+    '''Индекс в таблице SearchTerm для БД без FTS5.'''
+
+    def index_titles(self, titles):
+        titles = list(titles)
+        SearchTerm.objects.filter(
+            title__in=[title.pk for title in titles], review__isnull=True
+        ).delete()
+        terms = []
+        for title in titles:
+            weights = Counter()
+            for token in tokenize(title.name):
+                weights[token] += NAME_WEIGHT
+            for token in tokenize(title.description):
+                weights[token] += DESCRIPTION_WEIGHT
+            terms.extend(
+                SearchTerm(term=term, title_id=title.pk, weight=weight)
+                for term, weight in weights.items()
+            )
+        SearchTerm.objects.bulk_create(terms)
+
+    def index_reviews(self, reviews):
+        reviews = list(reviews)
+        self.remove_reviews(review.pk for review in reviews)
+        SearchTerm.objects.bulk_create(
+            SearchTerm(
+                term=term, title_id=review.title_id, review_id=review.pk,
+                weight=TEXT_WEIGHT * count
+            )
+            for review in reviews
+            for term, count in Counter(tokenize(review.text)).items()
+        )
+
+    def remove_titles(self, title_ids):
+        SearchTerm.objects.filter(title__in=list(title_ids)).delete()
+
+    def remove_reviews(self, review_ids):
+        SearchTerm.objects.filter(review__in=list(review_ids)).delete()
+
+    def search(self, tokens, limit):
+        tokens = set(tokens)
+        documents = SearchTerm.objects.filter(term__in=tokens).values(
+            'title_id', 'review_id'
+        ).annotate(
+            matched=Count('term', distinct=True), score=Sum('weight')
+        ).filter(matched=len(tokens)).order_by()
+        scores = defaultdict(int)
+        for document in documents:
+            scores[document['title_id']] += document['score']
+        return sorted(
+            scores, key=lambda title_id: (-scores[title_id], title_id)
+        )[:limit]
+
+    def clear(self):
+        SearchTerm.objects.all().delete()
+
+
+# Имя БД -> есть ли в ней таблицы FTS5.
+fts5_databases = {}
+
+
+def get_search_index():
+    '''FTS5, если таблицы созданы миграцией, иначе таблица слов.'''
+    backend = settings.SEARCH_INDEX
+    if backend == 'auto':
+        name = connection.settings_dict['NAME']
+        if name not in fts5_databases:
+            fts5_databases[name] = (
+                TITLE_FTS_TABLE in connection.introspection.table_names()
+            )
+        backend = 'fts5' if fts5_databases[name] else 'terms'
+    return Fts5SearchIndex() if backend == 'fts5' else TermSearchIndex()
@@ -0,0 +1,209 @@
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+
+from .models import (
+    MAX_SCORE, MIN_SCORE, Category, Comment, CustomUser, Genre, Review, Title,
+    TitleStats, score_field
+)
+from .search import get_search_index
+from .versions import bump_version
+
+VERSIONED_MODELS = (Category, Genre, Title, Review, Comment, CustomUser)
+
+
+def change_rating(title_id, score, count):
+    '''Атомарно сдвигает сумму и количество оценок произведения.'''
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=F('rating_sum') + score,
+        rating_count=F('rating_count') + count,
+    )
+
+
+def recount_ratings(titles):
+    '''Пересчитывает рейтинг произведений по их отзывам с нуля.'''
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    return titles.update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')), 0
+        ),
+        rating_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('pk')).values('total')), 0
+        ),
+    )
+
+
+def count_subquery(queryset):
+    return Coalesce(
+        Subquery(queryset.annotate(total=Count('pk')).values('total')), 0
+    )
+
+
+def latest_review_date():
+    return Subquery(
+        Review.objects.filter(
+            title=OuterRef('title')
+        ).order_by('-pub_date').values('pub_date')[:1]
+    )
+
+
+def change_stats(title_id, scores, comments=0):
+    '''
+    Атомарно сдвигает счётчики статистики произведения.
+
+    scores — изменения количества отзывов по оценкам, дата последнего
+    отзыва берётся по индексу отзывов произведения.
+    '''
+    TitleStats.objects.filter(title_id=title_id).update(
+        review_count=F('review_count') + sum(scores.values()),
+        comment_count=F('comment_count') + comments,
+        last_review_date=latest_review_date(),
+        **{
+            score_field(score): F(score_field(score)) + delta
+            for score, delta in scores.items()
+        }
+    )
+
+
+def stats_expressions():
+    '''Выражения для подсчёта всех полей TitleStats по отзывам.'''
+    reviews = Review.objects.filter(
+        title=OuterRef('title')
+    ).order_by().values('title')
+    comments = Comment.objects.filter(
+        review__title=OuterRef('title')
+    ).order_by().values('review__title')
+    return {
+        'review_count': count_subquery(reviews),
+        'comment_count': count_subquery(comments),
+        'last_review_date': latest_review_date(),
+        **{
+            score_field(score): count_subquery(reviews.filter(score=score))
+            for score in range(MIN_SCORE, MAX_SCORE + 1)
+        }
+    }
+
+
+def recount_stats(titles):
+    '''Пересчитывает статистику произведений с нуля, создавая строки.'''
+    TitleStats.objects.bulk_create(
+        [
+            TitleStats(title_id=pk) for pk in
+            titles.filter(stats__isnull=True).values_list('pk', flat=True)
+        ],
+        ignore_conflicts=True
+    )
+    return TitleStats.objects.filter(title__in=titles).update(
+        **stats_expressions()
+    )
+
+
+@receiver(post_save, sender=Title)
+def create_title_stats(sender, instance, created, **kwargs):
+    if created:
+        TitleStats.objects.create(title=instance)
+
+
+@receiver(pre_save, sender=Review)
+@receiver(pre_delete, sender=Review)
+def load_rated(sender, instance, **kwargs):
+    '''Учтённые произведение и оценку отзыва, загруженного без них.'''
+    if instance.rated is None and instance.pk is not None:
+        instance.rated = Review.objects.filter(pk=instance.pk).values_list(
+            'title_id', 'score'
+        ).first()
+
+
+@receiver(post_save, sender=Review)
+def update_aggregates_on_save(sender, instance, created, **kwargs):
+    current = (instance.title_id, instance.score)
+    if created:
+        change_rating(instance.title_id, instance.score, 1)
+        change_stats(instance.title_id, {instance.score: 1})
+    elif instance.rated is None:
+        # Строка появилась уже после pre_save: прежнего произведения нет.
+        titles = Title.objects.filter(pk=instance.title_id)
+        recount_ratings(titles)
+        recount_stats(titles)
+    elif instance.rated == current:
+        # Правка текста сдвигает pub_date (BaseTextAuthorModel.save).
+        change_stats(instance.title_id, {})
+    elif instance.rated[0] == instance.title_id:
+        change_rating(instance.title_id, instance.score - instance.rated[1], 0)
+        change_stats(
+            instance.title_id, {instance.rated[1]: -1, instance.score: 1}
+        )
+    else:
+        old_title_id, old_score = instance.rated
+        comments = instance.comments.count()
+        change_rating(old_title_id, -old_score, -1)
+        change_stats(old_title_id, {old_score: -1}, -comments)
+        change_rating(instance.title_id, instance.score, 1)
+        change_stats(instance.title_id, {instance.score: 1}, comments)
+    instance.rated = current
+
+
+@receiver(post_delete, sender=Review)
+def update_aggregates_on_delete(sender, instance, **kwargs):
+    if instance.rated is None:
+        return
+    title_id, score = instance.rated
+    change_rating(title_id, -score, -1)
+    change_stats(title_id, {score: -1})
+
+
+def change_comment_count(review_id, count):
+    TitleStats.objects.filter(title__reviews=review_id).update(
+        comment_count=F('comment_count') + count
+    )
+
+
+@receiver(post_save, sender=Comment)
+def update_comment_count_on_save(sender, instance, created, **kwargs):
+    if created:
+        change_comment_count(instance.review_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def update_comment_count_on_delete(sender, instance, **kwargs):
+    change_comment_count(instance.review_id, -1)
+
+
+def bump_model_version(sender, **kwargs):
+    bump_version(sender)
+
+
+for model in VERSIONED_MODELS:
+    post_save.connect(bump_model_version, sender=model)
+    post_delete.connect(bump_model_version, sender=model)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def bump_title_genre_version(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_version(sender)
+
+
+@receiver(post_save, sender=Title)
+def index_title(sender, instance, **kwargs):
+    get_search_index().index_titles([instance])
+
+
+@receiver(post_delete, sender=Title)
+def unindex_title(sender, instance, **kwargs):
+    get_search_index().remove_titles([instance.pk])
+
+
+@receiver(post_save, sender=Review)
+def index_review(sender, instance, **kwargs):
+    get_search_index().index_reviews([instance])
+
+
+@receiver(post_delete, sender=Review)
+def unindex_review(sender, instance, **kwargs):
+    get_search_index().remove_reviews([instance.pk])
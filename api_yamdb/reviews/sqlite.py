@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# Страницы, которые освобождает один шаг incremental_vacuum.
+VACUUM_PAGES = 1000
+PAGE_STATISTICS = ('page_size', 'page_count', 'freelist_count')
+
+
+@receiver(connection_created)
+def apply_pragmas(sender, connection, **kwargs):
+    '''
+    Настройки SQLite из SQLITE_PRAGMAS на каждое новое соединение.
+
+    busy_timeout идёт первым: переключение в WAL ждёт блокировку,
+    а не падает с «database is locked».
+    '''
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def read_pragma(cursor, name):
+    cursor.execute(f'PRAGMA {name}')
+    return cursor.fetchone()[0]
+
+
+def page_statistics(cursor):
+    return {name: read_pragma(cursor, name) for name in PAGE_STATISTICS}
@@ -0,0 +1,43 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+VERSION_CACHE_KEY = 'model_version:{}'
+# Есть, пока реплики могут не видеть последнюю запись в модель.
+BUMPED_CACHE_KEY = 'model_bumped:{}'
+
+
+def get_version_key(model):
+    # Изменение связи многие-ко-многим меняет модель, которая её объявила.
+    model = model._meta.auto_created or model
+    return VERSION_CACHE_KEY.format(model._meta.label_lower)
+
+
+def get_versions(models):
+    '''Текущие версии моделей; меняются при любой записи в модель.'''
+    keys = [get_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in set(keys) - versions.keys():
+        # Время как начальное значение не повторяет версии до вытеснения.
+        cache.add(key, time.time_ns(), settings.MODEL_VERSION_TIMEOUT)
+        versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_version(model):
+    key = get_version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), settings.MODEL_VERSION_TIMEOUT)
+    cache.set(
+        BUMPED_CACHE_KEY.format(key), True, settings.PRIMARY_PIN_SECONDS
+    )
+
+
+def recently_bumped(models):
+    '''Была ли запись в модели за последние PRIMARY_PIN_SECONDS.'''
+    return bool(cache.get_many([
+        BUMPED_CACHE_KEY.format(get_version_key(model)) for model in models
+    ]))
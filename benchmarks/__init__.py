@@ -0,0 +1,15 @@
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, 'api_yamdb'))
+
+
+def setup_django(db_path):
+    '''Настраивает Django на отдельную БД для замеров и создаёт схему.'''
+    os.environ['BENCHMARK_DB'] = str(db_path)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+    import django
+    from django.core.management import call_command
+    django.setup()
+    call_command('migrate', verbosity=0)
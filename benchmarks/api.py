@@ -0,0 +1,349 @@
+'''
+Время горячих путей API на синтетическом наборе данных.
+
+Запуск из корня репозитория:
+    python -m benchmarks.api --titles 100000 --reviews 5000000 \\
+        --comments 1000000 --output results.json
+
+С --db набор данных сохраняется в файле и при повторном запуске
+не генерируется заново. --compare печатает отношение медиан к
+результатам прошлого прогона.
+'''
+import argparse
+import csv
+import io
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from itertools import count
+from pathlib import Path
+
+from benchmarks import BASE_DIR, setup_django
+
+SCENARIOS = {}
+CONFIRMATION_CODE = '12345'
+
+
+def scenario(name, status=200):
+    def register(function):
+        SCENARIOS[name] = (function, status)
+        return function
+    return register
+
+
+class Context:
+    '''Клиенты и объекты, на которых выполняются сценарии.'''
+
+    def __init__(self, repeat):
+        from django.db.models import Count
+        from rest_framework.test import APIClient
+
+        from api.authentication import ClaimsAccessToken
+        from reviews.models import CustomUser, Review, Title
+
+        self.anonymous = APIClient()
+        self.user = CustomUser.objects.create(
+            username=f'bench{time.time_ns()}',
+            email=f'bench{time.time_ns()}@yamdb.fake',
+            confirmation_code=CONFIRMATION_CODE
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer {}'.format(
+            ClaimsAccessToken.for_user(self.user)
+        ))
+        self.title = Title.objects.order_by('-rating_count').first()
+        self.review = Review.objects.annotate(
+            comment_total=Count('comments')
+        ).order_by('-comment_total').first()
+        self.titles = iter(
+            Title.objects.values_list('pk', flat=True)[:repeat]
+        )
+        self.sequence = count()
+
+
+@scenario('title_list')
+def title_list(context):
+    return context.anonymous.get('/api/v1/titles/')
+
+
+@scenario('title_list_filter_name')
+def title_list_filter_name(context):
+    return context.anonymous.get(
+        '/api/v1/titles/', {'name': 'Произведение 1'}
+    )
+
+
+@scenario('title_list_filter_category')
+def title_list_filter_category(context):
+    return context.anonymous.get(
+        '/api/v1/titles/', {'category': 'category-1'}
+    )
+
+
+@scenario('title_list_filter_genre')
+def title_list_filter_genre(context):
+    return context.anonymous.get('/api/v1/titles/', {'genre': 'genre-1'})
+
+
+@scenario('title_list_filter_year')
+def title_list_filter_year(context):
+    return context.anonymous.get('/api/v1/titles/', {'year': 2000})
+
+
+@scenario('title_detail')
+def title_detail(context):
+    return context.anonymous.get(f'/api/v1/titles/{context.title.pk}/')
+
+
+@scenario('review_list')
+def review_list(context):
+    return context.anonymous.get(
+        f'/api/v1/titles/{context.title.pk}/reviews/'
+    )
+
+
+@scenario('review_create', status=201)
+def review_create(context):
+    # Отзыв на каждое произведение можно оставить один раз.
+    return context.client.post(
+        f'/api/v1/titles/{next(context.titles)}/reviews/',
+        {'text': 'Отзыв для замера', 'score': 7}
+    )
+
+
+@scenario('comment_list')
+def comment_list(context):
+    return context.anonymous.get(
+        f'/api/v1/titles/{context.review.title_id}/reviews/'
+        f'{context.review.pk}/comments/'
+    )
+
+
+@scenario('comment_create', status=201)
+def comment_create(context):
+    return context.client.post(
+        f'/api/v1/titles/{context.review.title_id}/reviews/'
+        f'{context.review.pk}/comments/',
+        {'text': 'Комментарий для замера'}
+    )
+
+
+@scenario('signup')
+def signup(context):
+    username = f'signup{time.time_ns()}{next(context.sequence)}'
+    return context.anonymous.post(
+        '/api/v1/auth/signup/',
+        {'username': username, 'email': f'{username}@yamdb.fake'}
+    )
+
+
+@scenario('token')
+def token(context):
+    return context.anonymous.post('/api/v1/auth/token/', {
+        'username': context.user.username,
+        'confirmation_code': CONFIRMATION_CODE
+    })
+
+
+def write_csv(path, rows, offset):
+    '''Файлы для csvall: по rows строк на файл, id начиная с offset.'''
+    ids = range(offset + 1, offset + rows + 1)
+    files = {
+        'users.csv': (
+            ('id', 'username', 'email', 'role', 'bio', 'first_name',
+             'last_name'),
+            ((idx, f'csv{idx}', f'csv{idx}@yamdb.fake', 'user', '', '', '')
+             for idx in ids)
+        ),
+        'category.csv': (
+            ('id', 'name', 'slug'),
+            ((idx, f'CSV {idx}', f'csv-{idx}') for idx in ids)
+        ),
+        'genre.csv': (
+            ('id', 'name', 'slug'),
+            ((idx, f'CSV {idx}', f'csv-{idx}') for idx in ids)
+        ),
+        'titles.csv': (
+            ('id', 'name', 'year', 'category'),
+            ((idx, f'CSV {idx}', 2000, idx) for idx in ids)
+        ),
+        'genre_title.csv': (
+            ('id', 'title_id', 'genre_id'),
+            ((idx, idx, idx) for idx in ids)
+        ),
+        'review.csv': (
+            ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+            ((idx, idx, 'CSV', idx, 5, '2020-01-01T00:00:00Z')
+             for idx in ids)
+        ),
+        'comments.csv': (
+            ('id', 'review_id', 'text', 'author', 'pub_date'),
+            ((idx, idx, 'CSV', idx, '2020-01-01T00:00:00Z') for idx in ids)
+        ),
+    }
+    for name, (header, lines) in files.items():
+        with open(path / name, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(header)
+            writer.writerows(lines)
+
+
+def measure_csv_import(rows, repeat):
+    from django.core.management import call_command
+    from django.db.models import Max
+
+    from reviews.models import Comment, CustomUser, Review, Title
+
+    timings = []
+    for _ in range(repeat):
+        offset = max(
+            model.objects.aggregate(top=Max('pk'))['top'] or 0
+            for model in (CustomUser, Title, Review, Comment)
+        ) + 1000
+        with tempfile.TemporaryDirectory() as tmp:
+            write_csv(Path(tmp), rows, offset)
+            started = time.perf_counter()
+            call_command(
+                'csvall', path=Path(tmp), stdout=io.StringIO()
+            )
+            timings.append((time.perf_counter() - started) * 1000)
+    return summarize(timings, [])
+
+
+def measure(function, status, context, repeat):
+    from django.db import connection
+
+    from api.queries import QueryRecorder
+
+    timings, queries = [], []
+    for _ in range(repeat):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            started = time.perf_counter()
+            response = function(context)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(recorder.count)
+        assert response.status_code == status, response.content
+    return summarize(timings, queries)
+
+
+def summarize(timings, queries):
+    timings = sorted(timings)
+    return {
+        'runs': len(timings),
+        'median_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(timings[int(0.95 * (len(timings) - 1))], 3),
+        'min_ms': round(timings[0], 3),
+        'max_ms': round(timings[-1], 3),
+        'queries': statistics.median(queries) if queries else None,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=BASE_DIR, check=True,
+            capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    baseline = json.loads(Path(baseline_path).read_text())['scenarios']
+    print('scenario'.ljust(28), 'before'.rjust(10), 'after'.rjust(10),
+          'ratio'.rjust(7))
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]['median_ms'], result['median_ms']
+        print(name.ljust(28), f'{before:8.2f}ms', f'{after:8.2f}ms',
+              f'{after / before:6.2f}x')
+
+
+def run(args, db_path):
+    setup_django(db_path)
+    from django.core.management import call_command
+
+    from reviews.models import Comment, CustomUser, Review, Title
+
+    if not Title.objects.exists():
+        started = time.perf_counter()
+        call_command(
+            'generate_data', users=args.users, titles=args.titles,
+            reviews=args.reviews, comments=args.comments, seed=args.seed,
+            stdout=io.StringIO()
+        )
+        print(f'Данные созданы за {time.perf_counter() - started:.1f} с')
+    volumes = {
+        'users': CustomUser.objects.count(),
+        'titles': Title.objects.count(),
+        'reviews': Review.objects.count(),
+        'comments': Comment.objects.count(),
+    }
+    context = Context(args.repeat)
+    results = {}
+    for name, (function, status) in SCENARIOS.items():
+        if args.scenarios and name not in args.scenarios:
+            continue
+        results[name] = measure(function, status, context, args.repeat)
+        print(name.ljust(28), f'{results[name]["median_ms"]:8.2f}ms',
+              f'queries={results[name]["queries"]}')
+    if not args.scenarios or 'csv_import' in args.scenarios:
+        results['csv_import'] = measure_csv_import(
+            args.csv_rows, args.csv_repeat
+        )
+        print('csv_import'.ljust(28),
+              f'{results["csv_import"]["median_ms"]:8.2f}ms')
+    return results, volumes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--titles', type=int, default=10000)
+    parser.add_argument('--reviews', type=int, default=100000)
+    parser.add_argument('--comments', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--csv-rows', type=int, default=1000)
+    parser.add_argument('--csv-repeat', type=int, default=3)
+    parser.add_argument(
+        '--scenarios', nargs='+',
+        choices=[*SCENARIOS, 'csv_import'], help='По умолчанию все'
+    )
+    parser.add_argument('--db', help='Файл SQLite для набора данных')
+    parser.add_argument('--output', help='Файл JSON для результатов')
+    parser.add_argument('--compare', help='JSON прошлого прогона')
+    args = parser.parse_args()
+
+    if args.db:
+        results, volumes = run(args, Path(args.db).resolve())
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            results, volumes = run(args, Path(tmp) / 'benchmark.sqlite3')
+    import django
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'date': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'volumes': volumes,
+            'seed': args.seed,
+            'repeat': args.repeat,
+        },
+        'scenarios': results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
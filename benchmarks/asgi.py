@@ -0,0 +1,156 @@
+'''
+Параллельность чтения под ASGI с медленной БД.
+
+Запуск из корня репозитория:
+    python -m benchmarks.asgi --delay 20 --concurrency 50 --requests 500
+
+Один процесс и один цикл событий: запросы карточек произведений
+идут одновременно, каждый запрос к БД задерживается на --delay мс.
+Режим sync — синхронные представления (общий поток синхронного
+кода), async — ASYNC_READS с чтением в пуле потоков.
+'''
+import argparse
+import asyncio
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks import setup_django
+
+MODES = {'sync': '0', 'async': '1'}
+
+
+def slow_database(delay):
+    '''Задержка перед каждым запросом к БД во всех соединениях.'''
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    def slow_execute(execute, sql, params, many, context):
+        time.sleep(delay / 1000)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        if slow_execute not in connection.execute_wrappers:
+            connection.execute_wrappers.append(slow_execute)
+
+    connection_created.connect(install, weak=False)
+    connections.close_all()
+
+
+async def get(application, path):
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path,
+        'raw_path': path.encode(), 'query_string': b'', 'root_path': '',
+        'headers': [(b'host', b'localhost')],
+        'server': ('localhost', 80), 'client': ('127.0.0.1', 50000),
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    return messages[0]['status']
+
+
+async def load(application, paths, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    timings = []
+
+    async def one(path):
+        async with semaphore:
+            started = time.perf_counter()
+            status = await get(application, path)
+            timings.append((time.perf_counter() - started) * 1000)
+            assert status == 200, f'{path}: {status}'
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(path) for path in paths))
+    return time.perf_counter() - started, sorted(timings)
+
+
+def run_mode(args):
+    '''Замер в отдельном процессе: ASYNC_READS читается при импорте URL.'''
+    setup_django(Path(args.db))
+    from django.core.asgi import get_asgi_application
+
+    from reviews.models import Title
+
+    application = get_asgi_application()
+    ids = list(Title.objects.values_list('pk', flat=True)[:100])
+    paths = [
+        f'/api/v1/titles/{ids[idx % len(ids)]}/'
+        for idx in range(args.requests)
+    ]
+    slow_database(args.delay)
+    elapsed, timings = asyncio.run(
+        load(application, paths, args.concurrency)
+    )
+    print(json.dumps({
+        'requests': len(timings),
+        'rps': round(len(timings) / elapsed, 1),
+        'median_ms': round(statistics.median(timings), 1),
+        'p95_ms': round(timings[int(0.95 * (len(timings) - 1))], 1),
+    }))
+
+
+def run(args, db_path):
+    setup_django(db_path)
+    from django.core.management import call_command
+
+    call_command(
+        'generate_data', users=10, titles=100, reviews=100, comments=0,
+        stdout=io.StringIO()
+    )
+    results = {}
+    for mode, flag in MODES.items():
+        output = subprocess.run(
+            [
+                sys.executable, '-m', 'benchmarks.asgi', '--mode', mode,
+                '--db', str(db_path), '--delay', str(args.delay),
+                '--concurrency', str(args.concurrency),
+                '--requests', str(args.requests),
+            ],
+            env={**os.environ, 'ASYNC_READS': flag}, check=True,
+            capture_output=True, text=True
+        ).stdout
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+        print(mode.ljust(6), f'{results[mode]["rps"]:8.1f} запросов/с',
+              f'median={results[mode]["median_ms"]}ms',
+              f'p95={results[mode]["p95_ms"]}ms')
+    speedup = results['async']['rps'] / results['sync']['rps']
+    print(f'Ускорение: {speedup:.1f}x')
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--delay', type=float, default=20,
+                        help='Задержка запроса к БД, мс')
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--db', help=argparse.SUPPRESS)
+    parser.add_argument('--output', help='Файл JSON для результатов')
+    args = parser.parse_args()
+    if args.mode:
+        run_mode(args)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run(args, Path(tmp) / 'benchmark.sqlite3')
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+'''
+Скорость рендеринга JSON на странице списка произведений.
+
+Запуск из корня репозитория:
+    python -m benchmarks.renderers --titles 1000 --page-size 100
+
+Сравнивает байты в секунду у JSONRenderer и FastJSONRenderer
+(orjson, если установлен) на одних и тех же данных ответа.
+'''
+import argparse
+import io
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks import setup_django
+
+
+def page_data(page_size):
+    '''Данные ответа списка произведений, как их отдаёт сериализатор.'''
+    from api.serializers import TitleReadSerializer
+    from reviews.models import Title
+
+    titles = Title.objects.select_related('category').prefetch_related(
+        'genre'
+    )[:page_size]
+    return {
+        'count': Title.objects.count(), 'next': None, 'previous': None,
+        'results': TitleReadSerializer(titles, many=True).data,
+    }
+
+
+def measure(renderer, data, repeat):
+    size = len(renderer.render(data))
+    started = time.perf_counter()
+    for _ in range(repeat):
+        renderer.render(data)
+    elapsed = time.perf_counter() - started
+    return {
+        'bytes': size,
+        'render_us': round(elapsed / repeat * 1e6, 2),
+        'mb_per_s': round(size * repeat / elapsed / 1e6, 2),
+    }
+
+
+def run(args, db_path):
+    setup_django(db_path)
+    from django.core.management import call_command
+    from rest_framework.renderers import JSONRenderer
+
+    from api import renderers
+
+    call_command(
+        'generate_data', users=10, titles=args.titles, reviews=args.titles,
+        comments=0, seed=args.seed, stdout=io.StringIO()
+    )
+    data = page_data(args.page_size)
+    candidates = {'json': JSONRenderer()}
+    if renderers.orjson is not None:
+        candidates['orjson'] = renderers.FastJSONRenderer()
+    results = {}
+    for name, renderer in candidates.items():
+        results[name] = measure(renderer, data, args.repeat)
+        print(name.ljust(8), f'{results[name]["render_us"]:10.1f}µs',
+              f'{results[name]["mb_per_s"]:8.1f} МБ/с')
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--titles', type=int, default=1000)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Файл JSON для результатов')
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run(args, Path(tmp) / 'benchmark.sqlite3')
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
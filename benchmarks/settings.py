@@ -0,0 +1,19 @@
+import os
+
+from api_yamdb.settings import *  # noqa: F401,F403
+
+DEBUG = False
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['BENCHMARK_DB'],
+    }
+}
+
+# Замеры идут мимо кэша ответов, иначе повторные запросы не трогают БД.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+    }
+}
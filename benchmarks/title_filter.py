@@ -0,0 +1,118 @@
+'''
+Время фильтрации списка произведений при росте каталога.
+
+Запуск из корня репозитория:
+    python -m benchmarks.title_filter --sizes 1000 10000 100000
+
+С --without-indexes регистронезависимые индексы удаляются, чтобы
+сравнить с полным просмотром таблиц.
+'''
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks import setup_django
+
+FILTERS = {
+    'name': {'name': 'TARGET TITLE 7'},
+    'category': {'category': 'TARGET-CATEGORY'},
+    'genre': {'genre': 'TARGET-GENRE'},
+}
+TARGET_SIZE = 20
+NOCASE_INDEXES = (
+    'title_name_nocase_idx', 'category_slug_nocase_idx',
+    'genre_slug_nocase_idx',
+)
+
+
+def fill(size, start):
+    '''Дописывает произведения до size; первые TARGET_SIZE — целевые.'''
+    from reviews.models import Category, Genre, Title
+
+    through = Title.genre.through
+    if start == 0:
+        # Нулевые категория и жанр — целевые, у них ровно TARGET_SIZE
+        # произведений при любом размере каталога.
+        Category.objects.bulk_create(
+            [Category(id=1, name='Целевая', slug='target-category')]
+            + [Category(id=idx, name=f'Категория {idx}',
+                        slug=f'category-{idx}') for idx in range(2, 102)]
+        )
+        Genre.objects.bulk_create(
+            [Genre(id=1, name='Целевой', slug='target-genre')]
+            + [Genre(id=idx, name=f'Жанр {idx}', slug=f'genre-{idx}')
+               for idx in range(2, 102)]
+        )
+        Title.objects.bulk_create(
+            Title(id=idx, name=f'Target title {idx}', year=2000,
+                  category_id=1)
+            for idx in range(1, TARGET_SIZE + 1)
+        )
+        through.objects.bulk_create(
+            through(title_id=idx, genre_id=1)
+            for idx in range(1, TARGET_SIZE + 1)
+        )
+        start = TARGET_SIZE
+    Title.objects.bulk_create(
+        (
+            Title(id=idx, name=f'Произведение {idx}', year=1900 + idx % 120,
+                  category_id=2 + idx % 100)
+            for idx in range(start + 1, size + 1)
+        ),
+        batch_size=5000,
+    )
+    through.objects.bulk_create(
+        (
+            through(title_id=idx, genre_id=2 + idx % 100)
+            for idx in range(start + 1, size + 1)
+        ),
+        batch_size=5000,
+    )
+
+
+def measure(client, params, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get('/api/v1/titles/', params)
+        timings.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, response.content
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[1000, 10000, 100000]
+    )
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--without-indexes', action='store_true')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(Path(tmp) / 'benchmark.sqlite3')
+        from django.db import connection
+        from rest_framework.test import APIClient
+
+        if args.without_indexes:
+            with connection.cursor() as cursor:
+                for index in NOCASE_INDEXES:
+                    cursor.execute(f'DROP INDEX {index}')
+        client = APIClient()
+        print('titles'.rjust(10), *(name.rjust(10) for name in FILTERS))
+        filled = 0
+        for size in sorted(args.sizes):
+            fill(size, filled)
+            filled = size
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+            print(str(size).rjust(10), *(
+                f'{measure(client, params, args.repeat):8.2f}ms'
+                for params in FILTERS.values()
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,10 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Очистка БД между тестами не проходит через сигналы версий моделей.
+    cache.clear()
+    yield
+    cache.clear()
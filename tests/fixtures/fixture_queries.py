@@ -0,0 +1,26 @@
+from contextlib import contextmanager
+
+import pytest
+from django.db import connection
+
+from api.queries import QueryRecorder, check_repeated
+
+
+@pytest.fixture(autouse=True)
+def fail_on_repeated_queries(settings):
+    settings.QUERY_REPEAT_ACTION = 'raise'
+
+
+@pytest.fixture
+def assert_no_repeated_queries():
+    '''
+    Контекстный менеджер: падает, если один вид SQL выполнен
+    больше threshold раз (по умолчанию QUERY_REPEAT_THRESHOLD).
+    '''
+    @contextmanager
+    def check(threshold=None):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            yield recorder
+        check_repeated(recorder, 'test', threshold, 'raise')
+    return check
@@ -411,3 +411,14 @@ class Test05ReviewAPI:
             f'Проверьте, что PUT-запрос к `{self.REVIEW_DETAIL_URL_TEMPLATE} '
             'не предусмотрен и возвращает статус 405.'
         )
+
+    def test_07_review_text_max_length(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = user_client.post(url, data={'text': 'a' * 257, 'score': 5})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что POST-запрос к `{self.REVIEWS_URL_TEMPLATE}` с '
+            'текстом длиннее 256 символов возвращает статус 400.'
+        )
+        response = user_client.post(url, data={'text': 'a' * 256, 'score': 5})
+        assert response.status_code == HTTPStatus.CREATED
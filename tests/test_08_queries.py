@@ -0,0 +1,143 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Comment, Genre, Review, Title
+
+
+def create_catalogue(size):
+    genres = [
+        Genre.objects.create(name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(3)
+    ]
+    for idx in range(size):
+        category = Category.objects.create(
+            name=f'Категория {idx}', slug=f'category-{idx}'
+        )
+        title = Title.objects.create(
+            name=f'Произведение {idx}', year=2000, category=category
+        )
+        title.genre.set(genres)
+    return Title.objects.first()
+
+
+def create_discussion(django_user_model, size):
+    title = create_catalogue(1)
+    review = None
+    for idx in range(size):
+        author = django_user_model.objects.create_user(
+            username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+        )
+        review = Review.objects.create(
+            title=title, author=author, text=f'Отзыв {idx}', score=5
+        )
+    for idx in range(size):
+        Comment.objects.create(
+            review=review, text=f'Комментарий {idx}',
+            author=django_user_model.objects.get(username=f'author{idx}')
+        )
+    return review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08QueryCount:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @pytest.mark.parametrize('size', (2, 10))
+    def test_01_title_list_queries(self, client, django_assert_num_queries,
+                                   size):
+        create_catalogue(size)
+        # COUNT для пагинации, произведения с категориями, жанры.
+        with django_assert_num_queries(3):
+            response = client.get(self.TITLES_URL)
+        assert len(response.json()['results']) == size, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` возвращает '
+            'все созданные произведения.'
+        )
+
+    def test_02_title_detail_queries(self, client, django_assert_num_queries):
+        title = create_catalogue(2)
+        # Произведение с категорией и его жанры.
+        with django_assert_num_queries(2):
+            client.get(
+                self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+            )
+
+    def test_03_double_review(self, user_client):
+        title = create_catalogue(1)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        user_client.post(url, data={'text': 'Отзыв', 'score': 7})
+        response = user_client.post(url, data={'text': 'Ещё', 'score': 1})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв на произведение не создаётся и '
+            'возвращается ответ со статусом 400.'
+        )
+        assert response.json() == {
+            'non_field_errors': [
+                'Нельзя оставить два отзыва на одно произведение.'
+            ]
+        }, (
+            'Проверьте, что ошибка повторного отзыва возвращается в поле '
+            '`non_field_errors`.'
+        )
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (7, 1), (
+            'Проверьте, что отклонённый отзыв не меняет рейтинг.'
+        )
+
+    @pytest.mark.parametrize('size', (2, 10))
+    def test_04_review_list_queries(self, client, django_user_model,
+                                    django_assert_num_queries, size):
+        review = create_discussion(django_user_model, size)
+        # Произведение, COUNT для пагинации, отзывы с авторами.
+        with django_assert_num_queries(3):
+            response = client.get(
+                self.REVIEWS_URL_TEMPLATE.format(title_id=review.title_id)
+            )
+        assert len(response.json()['results']) == size, (
+            'Проверьте, что GET-запрос к '
+            f'`{self.REVIEWS_URL_TEMPLATE}` возвращает все отзывы.'
+        )
+
+    @pytest.mark.parametrize('size', (2, 10))
+    def test_05_comment_list_queries(self, client, django_user_model,
+                                     django_assert_num_queries, size):
+        review = create_discussion(django_user_model, size)
+        # Отзыв, COUNT для пагинации, комментарии с авторами.
+        with django_assert_num_queries(3):
+            response = client.get(self.COMMENTS_URL_TEMPLATE.format(
+                title_id=review.title_id, review_id=review.id
+            ))
+        assert len(response.json()['results']) == size, (
+            'Проверьте, что GET-запрос к '
+            f'`{self.COMMENTS_URL_TEMPLATE}` возвращает все комментарии.'
+        )
+
+    def test_06_comment_post_loads_review_once(self, user_client,
+                                               django_user_model):
+        review = create_discussion(django_user_model, 1)
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(
+                self.COMMENTS_URL_TEMPLATE.format(
+                    title_id=review.title_id, review_id=review.id
+                ),
+                data={'text': 'Новый комментарий'}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        review_selects = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_review"' in query['sql']
+        ]
+        assert len(review_selects) == 1, (
+            'Проверьте, что при создании комментария отзыв загружается '
+            'из БД один раз за запрос.'
+        )
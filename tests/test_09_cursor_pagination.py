@@ -0,0 +1,39 @@
+import pytest
+
+from reviews.models import Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09CursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_page_number_by_default(self, client):
+        response = client.get(self.TITLES_URL)
+        assert 'count' in response.json(), (
+            f'Проверьте, что по умолчанию эндпоинт `{self.TITLES_URL}` '
+            'использует постраничную пагинацию с ключом `count`.'
+        )
+
+    def test_02_cursor_walks_all_titles(self, client):
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {idx % 7}', year=2000)
+            for idx in range(25)
+        )
+        expected = list(
+            Title.objects.order_by('name', 'id').values_list('id', flat=True)
+        )
+        url = f'{self.TITLES_URL}?pagination=cursor'
+        received = []
+        while url:
+            data = client.get(url).json()
+            assert 'count' not in data, (
+                'Проверьте, что в режиме `?pagination=cursor` не считается '
+                'общее количество объектов.'
+            )
+            received.extend(title['id'] for title in data['results'])
+            url = data['next']
+        assert received == expected, (
+            'Проверьте, что обход по курсору возвращает все произведения '
+            'в порядке `name, id` без пропусков и повторов.'
+        )
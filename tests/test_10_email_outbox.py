@@ -0,0 +1,117 @@
+from http import HTTPStatus
+from io import StringIO
+from smtplib import SMTPException
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from reviews.management.commands.send_emails import Command
+from reviews.models import OutgoingEmail
+
+
+class StopLoop(Exception):
+    '''Прерывает send_emails --loop вместо паузы.'''
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    VALID_DATA = {
+        'email': 'outbox@yamdb.fake',
+        'username': 'outbox_user'
+    }
+
+    def test_01_signup_enqueues_email(self, client):
+        outbox_before_count = len(mail.outbox)
+        response = client.post(self.URL_SIGNUP, data=self.VALID_DATA)
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == outbox_before_count, (
+            'Регистрация не должна отправлять письмо синхронно.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == self.VALID_DATA['email']
+        assert email.sent_at is None
+
+        call_command('send_emails')
+        assert len(mail.outbox) == outbox_before_count + 1
+        assert mail.outbox[-1].to == [self.VALID_DATA['email']]
+        email.refresh_from_db()
+        assert email.sent_at is not None
+
+        call_command('send_emails')
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Отправленное письмо не должно отправляться повторно.'
+        )
+
+    def test_02_failed_email_is_retried_later(self, client):
+        client.post(self.URL_SIGNUP, data=self.VALID_DATA)
+        with mock.patch.object(
+            EmailBackend, 'send_messages', side_effect=SMTPException('down')
+        ):
+            call_command('send_emails')
+        email = OutgoingEmail.objects.get()
+        assert email.sent_at is None
+        assert email.attempts == 1
+        assert email.last_error == 'down'
+        assert email.send_after > email.created_at
+
+        outbox_before_count = len(mail.outbox)
+        call_command('send_emails')
+        assert len(mail.outbox) == outbox_before_count, (
+            'Письмо с ошибкой отправки должно ждать паузы перед повтором.'
+        )
+
+        OutgoingEmail.objects.update(send_after=email.created_at)
+        call_command('send_emails')
+        assert len(mail.outbox) == outbox_before_count + 1
+
+    def test_03_connection_failure(self, client):
+        client.post(self.URL_SIGNUP, data=self.VALID_DATA)
+        refused = mock.patch.object(
+            EmailBackend, 'open', side_effect=SMTPException('refused')
+        )
+        with refused, pytest.raises(CommandError, match='refused'):
+            call_command('send_emails')
+        err = StringIO()
+        with refused, mock.patch(
+            'reviews.management.commands.send_emails.time.sleep',
+            side_effect=StopLoop
+        ), pytest.raises(StopLoop):
+            call_command('send_emails', loop=True, stderr=err)
+        assert 'refused' in err.getvalue(), (
+            'Проверьте, что `send_emails --loop` сообщает об ошибке '
+            'соединения и продолжает работу.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert (email.attempts, email.sent_at) == (0, None), (
+            'Ошибка соединения не должна тратить попытки отправки письма.'
+        )
+        call_command('send_emails')
+        assert OutgoingEmail.objects.get().sent_at is not None
+
+    def test_04_claimed_email_is_sent_once(self, client):
+        client.post(self.URL_SIGNUP, data=self.VALID_DATA)
+        now = timezone.now()
+        # Оба процесса выбрали письмо до того, как первый его занял.
+        pending = list(OutgoingEmail.objects.all())
+        assert len(Command().claim(pending, now)) == 1
+        assert Command().claim(pending, now) == [], (
+            'Проверьте, что письмо, занятое одним процессом, не занимает '
+            'другой.'
+        )
+        outbox_before_count = len(mail.outbox)
+        call_command('send_emails')
+        assert len(mail.outbox) == outbox_before_count, (
+            'Занятое письмо не должно отправляться другим процессом.'
+        )
+        OutgoingEmail.objects.update(send_after=now)
+        call_command('send_emails')
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что письмо упавшего процесса отправляется после '
+            '`EMAIL_OUTBOX_LEASE`.'
+        )
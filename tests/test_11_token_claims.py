@@ -0,0 +1,91 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from reviews.models import ADMIN, TOKEN_VERSION_CACHE_KEY, USER
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TokenClaims:
+
+    URL_TOKEN = '/api/v1/auth/token/'
+    URL_USERS = '/api/v1/users/'
+    URL_ME = '/api/v1/users/me/'
+
+    def get_client(self, user):
+        user.confirmation_code = '12345'
+        user.save()
+        response = APIClient().post(self.URL_TOKEN, data={
+            'username': user.username, 'confirmation_code': '12345'
+        })
+        assert response.status_code == HTTPStatus.OK
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}'
+        )
+        return client
+
+    def test_01_no_user_query_per_request(self, admin,
+                                          django_assert_num_queries):
+        client = self.get_client(admin)
+        client.get(self.URL_USERS)
+        # COUNT для пагинации и сами пользователи, без загрузки admin.
+        with django_assert_num_queries(2):
+            response = client.get(self.URL_USERS)
+        assert response.status_code == HTTPStatus.OK, (
+            'Администратор с токеном из `/api/v1/auth/token/` должен '
+            f'получать список пользователей `{self.URL_USERS}`.'
+        )
+
+    def test_02_profile_loads_user_lazily(self, user,
+                                          django_assert_num_queries):
+        client = self.get_client(user)
+        client.get(self.URL_ME)
+        with django_assert_num_queries(1):
+            response = client.get(self.URL_ME)
+        assert response.json()['bio'] == user.bio
+
+    def test_03_role_change_revokes_token(self, user):
+        client = self.get_client(user)
+        assert client.get(self.URL_ME).status_code == HTTPStatus.OK
+        user.role = ADMIN
+        user.save()
+        response = client.get(self.URL_ME)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'После смены роли старый токен пользователя должен '
+            'перестать работать.'
+        )
+        client = self.get_client(user)
+        assert client.get(self.URL_USERS).status_code == HTTPStatus.OK
+        user.role = USER
+        user.save()
+        assert client.get(self.URL_USERS).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+
+    def test_04_profile_update_keeps_revocation(self, admin,
+                                                 django_user_model):
+        client = self.get_client(admin)
+        client.get(self.URL_ME)
+        stale_version = admin.token_version
+        admin.role = USER
+        admin.save()
+        # Другой процесс ещё помнит прежнюю версию токена.
+        key = TOKEN_VERSION_CACHE_KEY.format(admin.pk)
+        cache.set(key, stale_version)
+        response = client.patch(self.URL_ME, data={'bio': 'Новое'})
+        assert response.status_code == HTTPStatus.OK
+        admin = django_user_model.objects.get(pk=admin.pk)
+        assert admin.bio == 'Новое'
+        assert (admin.role, admin.token_version) == (
+            USER, stale_version + 1
+        ), (
+            'Проверьте, что правка профиля по старому токену не '
+            'возвращает прежние роль и версию токена.'
+        )
+        cache.delete(key)
+        assert client.get(self.URL_ME).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
@@ -0,0 +1,107 @@
+import time
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_categories, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ConditionalGet:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_not_modified_without_queries(self, admin_client, client,
+                                              django_assert_num_queries):
+        create_categories(admin_client)
+        response = client.get(self.CATEGORIES_URL)
+        etag = response['ETag']
+        with django_assert_num_queries(0):
+            response = client.get(
+                self.CATEGORIES_URL, HTTP_IF_NONE_MATCH=etag
+            )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{self.CATEGORIES_URL}` с '
+            'актуальным `If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert not response.content
+
+        admin_client.delete(f'{self.CATEGORIES_URL}books/')
+        response = client.get(self.CATEGORIES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'После изменения категорий прежний ETag не должен давать 304.'
+        )
+        assert response['ETag'] != etag
+
+    def test_02_title_etag_follows_reviews(self, admin_client, client,
+                                           user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        etag = client.get(url)['ETag']
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == (
+            HTTPStatus.NOT_MODIFIED
+        )
+        user_client.post(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            data={'text': 'text', 'score': 8}
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Новый отзыв меняет рейтинг, поэтому ETag произведения '
+            'должен измениться.'
+        )
+        assert response.json()['rating'] == 8
+
+    def test_03_etag_expires_with_version(self, admin_client, client,
+                                          monkeypatch, settings):
+        settings.MODEL_VERSION_TIMEOUT = 60
+        create_categories(admin_client)
+        etag = client.get(self.CATEGORIES_URL)['ETag']
+        # Запись в другом воркере не видна кэшу этого процесса: ETag
+        # обязан смениться хотя бы с истечением версии.
+        now = time.time()
+        monkeypatch.setattr(
+            time, 'time', lambda: now + settings.MODEL_VERSION_TIMEOUT + 1
+        )
+        response = client.get(self.CATEGORIES_URL, HTTP_IF_NONE_MATCH=etag)
+        monkeypatch.undo()
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что версия модели истекает через '
+            '`MODEL_VERSION_TIMEOUT` и прежний ETag перестаёт давать 304.'
+        )
+        assert response['ETag'] != etag
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ListCache:
+
+    GENRES_URL = '/api/v1/genres/'
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_genre_list_cached_until_write(self, admin_client, client,
+                                              django_assert_num_queries):
+        admin_client.post(self.GENRES_URL, data={'name': 'Рок', 'slug': 'rock'})
+        client.get(self.GENRES_URL, {'search': 'Рок'})
+        with django_assert_num_queries(0):
+            response = client.get(self.GENRES_URL, {'search': 'Рок'})
+        assert response.json()['count'] == 1
+
+        admin_client.post(
+            self.GENRES_URL, data={'name': 'Рок-н-ролл', 'slug': 'rocknroll'}
+        )
+        response = client.get(self.GENRES_URL, {'search': 'Рок'})
+        assert response.json()['count'] == 2, (
+            'Создание жанра должно сбрасывать кэш списка жанров.'
+        )
+
+    def test_02_title_list_cached_for_anonymous(self, admin_client, client,
+                                                django_assert_num_queries):
+        create_titles(admin_client)
+        client.get(self.TITLES_URL)
+        with django_assert_num_queries(0):
+            client.get(self.TITLES_URL)
+        # Пользователь, COUNT, произведения и жанры: кэш только для анонимов.
+        with django_assert_num_queries(4):
+            admin_client.get(self.TITLES_URL)
@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Review, Title
+from tests.utils import create_single_review
+
+
+@pytest.fixture(params=('fts5', 'terms'))
+def search_index(request, settings):
+    settings.SEARCH_INDEX = request.param
+    return request.param
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13Search:
+
+    SEARCH_URL = '/api/v1/search/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def search(self, client, query):
+        response = client.get(self.SEARCH_URL, {'q': query})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.SEARCH_URL}` с параметром '
+            '`q` возвращает ответ со статусом 200.'
+        )
+        return [title['id'] for title in response.json()['results']]
+
+    def test_01_query_required(self, client):
+        response = client.get(self.SEARCH_URL)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_ranked_by_field(self, client, search_index):
+        in_name = Title.objects.create(name='Тайная Крепость', year=1958)
+        in_description = Title.objects.create(
+            name='Скрытая', year=1958, description='Осада крепости; крепость'
+        )
+        Title.objects.create(name='Другое', year=1958)
+        assert self.search(client, 'крепость') == [
+            in_name.id, in_description.id
+        ], (
+            'Совпадение в названии должно быть выше совпадения в описании, '
+            'произведения без совпадений не должны попадать в выдачу.'
+        )
+        assert self.search(client, 'тайная КРЕПОСТЬ') == [in_name.id]
+
+        in_name.name = 'Тайная башня'
+        in_name.save()
+        assert self.search(client, 'крепость') == [in_description.id]
+        in_description.delete()
+        assert self.search(client, 'крепость') == []
+
+    def test_03_review_text(self, client, search_index, user, user_client,
+                            moderator):
+        title = Title.objects.create(name='Фильм', year=2000)
+        response = create_single_review(
+            user_client, title.id, 'Неожиданный финал', 8
+        )
+        assert self.search(client, 'финал') == [title.id]
+        user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title.id, review_id=response.json()['id']
+            ),
+            data={'text': 'Скучно'}
+        )
+        assert self.search(client, 'финал') == []
+        Review.objects.create(
+            title=title, author=moderator, text='скучно и долго', score=2
+        )
+        assert self.search(client, 'скучно') == [title.id]
+        title.delete()
+        assert self.search(client, 'скучно') == []
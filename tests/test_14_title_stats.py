@@ -0,0 +1,146 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from reviews.models import Comment, Review, Title, TitleStats
+
+
+def create_title():
+    return Title.objects.create(name='Произведение', year=2000)
+
+
+def get_stats(title):
+    return TitleStats.objects.get(title=title)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleStats:
+
+    TITLES_URL = '/api/v1/titles/'
+    STATS_URL_TEMPLATE = '/api/v1/titles/{title_id}/stats/'
+
+    def test_01_stats_follow_reviews(self, admin, moderator, user):
+        title = create_title()
+        other = Title.objects.create(name='Другое', year=2001)
+        first = Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=9
+        )
+        second = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=3
+        )
+        Comment.objects.create(review=first, author=user, text='Да')
+        Comment.objects.create(review=first, author=moderator, text='Нет')
+        stats = get_stats(title)
+        assert (stats.review_count, stats.comment_count) == (2, 2), (
+            'Проверьте, что статистика считает отзывы и комментарии.'
+        )
+        assert stats.scores[9] == 1 and stats.scores[3] == 1
+        assert stats.last_review_date == second.pub_date
+
+        second.score = 4
+        second.save()
+        assert get_stats(title).scores[3] == 0, (
+            'Проверьте, что смена оценки переносит отзыв в гистограмме.'
+        )
+        assert get_stats(title).scores[4] == 1
+
+        first.title = other
+        first.save()
+        stats = get_stats(title)
+        assert (stats.review_count, stats.comment_count) == (1, 0), (
+            'Проверьте, что перенос отзыва переносит его комментарии.'
+        )
+        assert get_stats(other).comment_count == 2
+
+        first.delete()
+        stats = get_stats(other)
+        assert (stats.review_count, stats.comment_count) == (0, 0), (
+            'Проверьте, что удаление отзыва вычитает его и комментарии.'
+        )
+        assert stats.last_review_date is None
+
+    def test_02_stats_endpoint(self, client, user_client, admin_client):
+        title = create_title()
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+        review = user_client.post(
+            reviews_url, data={'text': 'Отзыв', 'score': 6}
+        ).json()
+        admin_client.post(
+            f'{reviews_url}{review["id"]}/comments/', data={'text': 'Да'}
+        )
+        response = client.get(self.STATS_URL_TEMPLATE.format(
+            title_id=title.id
+        ))
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.STATS_URL_TEMPLATE}` '
+            'доступен без токена.'
+        )
+        data = response.json()
+        assert data['review_count'] == 1 and data['comment_count'] == 1
+        assert data['scores']['6'] == 1
+        assert data['last_review_date'] == review['pub_date']
+
+        response = client.get(self.STATS_URL_TEMPLATE.format(title_id=0))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_title_list_includes_stats(self, client, user,
+                                          django_assert_num_queries):
+        title = create_title()
+        response = client.get(self.TITLES_URL)
+        assert 'stats' not in response.json()['results'][0], (
+            'Проверьте, что статистика выдаётся только по запросу.'
+        )
+        # COUNT для пагинации, произведения с категориями и статистикой,
+        # жанры.
+        with django_assert_num_queries(3):
+            response = client.get(self.TITLES_URL, {'include': 'stats'})
+        stats = response.json()['results'][0]['stats']
+        assert stats['review_count'] == 0, (
+            'Проверьте, что `include=stats` добавляет статистику '
+            'к произведениям.'
+        )
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=5
+        )
+        Comment.objects.create(review=review, author=user, text='Да')
+        stats = client.get(
+            self.TITLES_URL, {'include': 'stats'}
+        ).json()['results'][0]['stats']
+        assert stats['comment_count'] == 1, (
+            'Проверьте, что кэш списка со статистикой сбрасывается '
+            'новым комментарием.'
+        )
+
+    def test_04_rebuild_title_stats(self, client, user):
+        title = create_title()
+        Review.objects.create(title=title, author=user, text='Да', score=5)
+        TitleStats.objects.filter(title=title).update(review_count=7)
+        with pytest.raises(CommandError):
+            call_command('rebuild_title_stats', '--check')
+        call_command('rebuild_title_stats')
+        call_command('rebuild_title_stats', '--check')
+        assert get_stats(title).review_count == 1, (
+            'Проверьте, что `rebuild_title_stats` исправляет расхождения.'
+        )
+
+        TitleStats.objects.filter(title=title).update(comment_count=3)
+        response = client.get(self.TITLES_URL, {'include': 'stats'})
+        assert response.json()['results'][0]['stats']['comment_count'] == 3
+        call_command('rebuild_title_stats')
+        response = client.get(self.TITLES_URL, {'include': 'stats'})
+        assert response.json()['results'][0]['stats']['comment_count'] == 0, (
+            'Проверьте, что `rebuild_title_stats` сбрасывает кэш списка '
+            'со статистикой.'
+        )
+
+        TitleStats.objects.all().delete()
+        url = self.STATS_URL_TEMPLATE.format(title_id=title.id)
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что GET-запрос к статистике не записывает в БД.'
+        )
+        call_command('rebuild_title_stats')
+        assert client.get(url).json()['scores']['5'] == 1, (
+            'Проверьте, что `rebuild_title_stats` создаёт недостающие '
+            'строки статистики.'
+        )
@@ -0,0 +1,52 @@
+import logging
+from http import HTTPStatus
+
+import pytest
+
+from api.metrics import registry
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15Metrics:
+
+    METRICS_URL = '/api/v1/metrics/'
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_metrics_per_route(self, client, admin_client):
+        registry.reset()
+        for _ in range(3):
+            client.get(self.TITLES_URL)
+        client.get('/api/v1/unknown/')
+        response = admin_client.get(self.METRICS_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос администратора к '
+            f'`{self.METRICS_URL}` возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        titles = data.get('api:titles-list')
+        assert titles and titles['count'] == 3, (
+            'Проверьте, что метрики собираются по имени маршрута.'
+        )
+        assert titles['queries']['max'] >= 1
+        assert titles['wall_ms']['max'] >= titles['db_ms']['max']
+        assert sum(titles['wall_ms']['buckets'].values()) == 3
+        assert not any('unknown' in route for route in data), (
+            'Проверьте, что запросы без маршрута не учитываются.'
+        )
+
+    def test_02_metrics_admin_only(self, client, user_client):
+        assert client.get(self.METRICS_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert user_client.get(self.METRICS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        ), 'Проверьте, что метрики доступны только администратору.'
+
+    def test_03_metrics_log(self, client, caplog, settings):
+        settings.METRICS_LOG_INTERVAL = 0
+        with caplog.at_level(logging.INFO, logger='api.metrics'):
+            client.get(self.TITLES_URL)
+        assert any(
+            'api:titles-list' in record.getMessage()
+            for record in caplog.records
+        ), 'Проверьте, что сводка метрик периодически пишется в лог.'
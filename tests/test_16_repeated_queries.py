@@ -0,0 +1,81 @@
+import logging
+
+import pytest
+from django.test import Client
+
+from api.queries import (
+    QueryRecorder, RepeatedQueriesError, check_repeated, normalize_sql
+)
+from reviews.models import Category, Genre, Title
+from tests.test_08_queries import create_discussion
+
+
+def create_titles(size):
+    genres = Genre.objects.all()
+    category = Category.objects.first()
+    for idx in range(size):
+        Title.objects.create(
+            name=f'Ещё произведение {idx}', year=2001, category=category
+        ).genre.set(genres)
+
+
+def test_normalize_sql():
+    assert normalize_sql(
+        'SELECT * FROM t WHERE id = 15 AND name = \'it\'\'s\''
+    ) == normalize_sql('SELECT * FROM t WHERE id = 2 AND name = \'x\''), (
+        'Проверьте, что литералы не влияют на вид запроса.'
+    )
+    assert normalize_sql(
+        'SELECT * FROM t WHERE id IN (%s, %s, %s)'
+    ) == 'SELECT * FROM t WHERE id IN (...)', (
+        'Проверьте, что IN-списки любой длины дают один вид запроса.'
+    )
+    assert normalize_sql('SELECT score_10 FROM t') == (
+        'SELECT score_10 FROM t'
+    )
+
+
+def test_check_repeated(caplog):
+    recorder = QueryRecorder()
+    recorder.shapes.update(['SELECT ?'] * 3 + ['SELECT ? FROM t'])
+    check_repeated(recorder, 'route', threshold=3)
+    with caplog.at_level(logging.WARNING, logger='api.queries'):
+        check_repeated(recorder, 'route', threshold=2, action='warn')
+    assert '3× SELECT ?' in caplog.text, (
+        'Проверьте, что повторы запросов пишутся в лог.'
+    )
+    with pytest.raises(RepeatedQueriesError):
+        check_repeated(recorder, 'route', threshold=2, action='raise')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16RepeatedQueries:
+
+    def test_01_api_lists(self, client, django_user_model,
+                          assert_no_repeated_queries):
+        review = create_discussion(django_user_model, 10)
+        create_titles(10)
+        for url in (
+            '/api/v1/titles/',
+            '/api/v1/titles/?include=stats',
+            f'/api/v1/titles/{review.title_id}/reviews/',
+            f'/api/v1/titles/{review.title_id}/reviews/{review.id}/'
+            'comments/',
+        ):
+            with assert_no_repeated_queries(threshold=1):
+                client.get(url)
+
+    def test_02_admin_changelists(self, django_user_model,
+                                  assert_no_repeated_queries):
+        create_discussion(django_user_model, 10)
+        create_titles(10)
+        client = Client()
+        client.force_login(django_user_model.objects.create_superuser(
+            'root', 'root@yamdb.fake', 'password'
+        ))
+        for model in ('title', 'review', 'comment'):
+            # Админка дважды выполняет COUNT для пагинации.
+            with assert_no_repeated_queries(threshold=2):
+                client.get(f'/admin/reviews/{model}/')
+            with assert_no_repeated_queries(threshold=2):
+                client.get(f'/admin/reviews/{model}/1/change/')
@@ -0,0 +1,77 @@
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import Count
+
+from reviews.management.commands.generate_data import zipf_counts
+from reviews.models import (
+    Category, Comment, CustomUser, Genre, Review, Title
+)
+
+OPTIONS = {
+    'users': 30, 'categories': 3, 'genres': 8, 'titles': 40,
+    'reviews': 300, 'comments': 120, 'max_genres': 4, 'seed': 7,
+}
+
+
+def snapshot():
+    return (
+        list(Review.objects.order_by('id').values_list(
+            'id', 'title_id', 'author_id', 'score'
+        )),
+        list(Comment.objects.order_by('id').values_list(
+            'review_id', 'author_id'
+        )),
+        list(Title.genre.through.objects.order_by('id').values_list(
+            'title_id', 'genre_id'
+        )),
+    )
+
+
+def test_zipf_counts():
+    counts = zipf_counts(1000, 50, 1.1, 100)
+    assert sum(counts) == 1000
+    assert max(counts) == 100, 'Проверьте, что корзины не больше cap.'
+    assert counts[0] > 10 * counts[-1], (
+        'Проверьте, что распределение смещено к первым корзинам.'
+    )
+    with pytest.raises(CommandError):
+        zipf_counts(101, 10, 1.1, 10)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17GenerateData:
+
+    def test_01_volumes_and_skew(self):
+        call_command('generate_data', **OPTIONS)
+        assert CustomUser.objects.count() == OPTIONS['users']
+        assert Title.objects.count() == OPTIONS['titles']
+        assert Review.objects.count() == OPTIONS['reviews']
+        assert Comment.objects.count() == OPTIONS['comments']
+        assert CustomUser.objects.values('role').distinct().count() > 1, (
+            'Проверьте, что у пользователей разные роли.'
+        )
+        reviews = sorted(
+            Title.objects.annotate(total=Count('reviews')).values_list(
+                'total', flat=True
+            ), reverse=True
+        )
+        assert reviews[0] > 5 * reviews[-1] + 1, (
+            'Проверьте, что отзывы распределены по произведениям неравномерно.'
+        )
+        assert Title.genre.through.objects.values('title').annotate(
+            total=Count('genre')
+        ).filter(total__gt=1).exists(), (
+            'Проверьте, что у произведений бывает несколько жанров.'
+        )
+        call_command('rebuild_ratings', '--check')
+        call_command('rebuild_title_stats', '--check')
+
+    def test_02_same_seed_same_data(self):
+        call_command('generate_data', **OPTIONS)
+        first = snapshot()
+        for model in (CustomUser, Title, Category, Genre):
+            model.objects.all().delete()
+        call_command('generate_data', **OPTIONS)
+        assert snapshot() == first, (
+            'Проверьте, что одно зерно даёт одни и те же данные.'
+        )
@@ -0,0 +1,85 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.export import DATASETS, get_file_name
+from reviews.models import Category, CustomUser, Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Export:
+
+    EXPORT_URL_TEMPLATE = '/api/v1/export/{dataset}.{file_format}'
+
+    def test_01_csv_round_trip(self, tmp_path):
+        call_command('csvall', workers=1)
+        title = Title.objects.first()
+        description = 'Описание, с "кавычками"\nи переводом строки'
+        Title.objects.filter(pk=title.pk).update(description=description)
+        call_command('export_data', path=tmp_path / 'first')
+        for model in (CustomUser, Title, Category, Genre):
+            model.objects.all().delete()
+        call_command('csvall', path=tmp_path / 'first', workers=1)
+        assert Title.objects.get(pk=title.pk).description == description, (
+            'Проверьте, что импорт произведений читает колонку `description`.'
+        )
+        call_command('export_data', path=tmp_path / 'second')
+        for dataset in DATASETS:
+            file_name = get_file_name(dataset, 'csv')
+            first = (tmp_path / 'first' / file_name).read_text()
+            assert first.count('\n') > 1, (
+                f'Проверьте, что выгрузка `{file_name}` содержит строки.'
+            )
+            assert first == (tmp_path / 'second' / file_name).read_text(), (
+                f'Проверьте, что `{file_name}` после импорта выгружается '
+                'без изменений.'
+            )
+
+    def test_02_ndjson_endpoint(self, admin_client, user):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        genres = [
+            Genre.objects.create(name=name, slug=name)
+            for name in ('drama', 'comedy')
+        ]
+        title = Title.objects.create(
+            name='Произведение', year=2000, category=category
+        )
+        title.genre.set(genres)
+        Review.objects.create(title=title, author=user, text='Да', score=8)
+        response = admin_client.get(self.EXPORT_URL_TEMPLATE.format(
+            dataset='titles', file_format='ndjson'
+        ))
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что администратор может выгрузить произведения.'
+        )
+        assert response.streaming, (
+            'Проверьте, что выгрузка отдаётся потоком.'
+        )
+        rows = [
+            json.loads(line)
+            for line in b''.join(response.streaming_content).splitlines()
+        ]
+        assert rows == [{
+            'id': title.id, 'name': 'Произведение', 'year': 2000,
+            'category': category.id, 'category_slug': 'movie',
+            'description': '', 'rating': 8, 'genres': ['comedy', 'drama'],
+        }], 'Проверьте состав строки выгрузки произведений.'
+
+    def test_03_export_permissions(self, client, user_client, admin_client):
+        url = self.EXPORT_URL_TEMPLATE.format(
+            dataset='reviews', file_format='csv'
+        )
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что выгрузка доступна только администратору.'
+        )
+        response = admin_client.get(url, HTTP_ACCEPT='text/csv')
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Disposition'] == (
+            'attachment; filename="review.csv"'
+        )
+        assert admin_client.get(self.EXPORT_URL_TEMPLATE.format(
+            dataset='secrets', file_format='csv'
+        )).status_code == HTTPStatus.NOT_FOUND
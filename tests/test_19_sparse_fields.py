@@ -0,0 +1,119 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.test_08_queries import create_catalogue, create_discussion
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19SparseFields:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_title_list_fields(self, client, django_assert_num_queries):
+        create_catalogue(3)
+        # COUNT для пагинации и произведения без связей.
+        with django_assert_num_queries(2):
+            response = client.get(
+                self.TITLES_URL, {'fields': 'id,name,rating'}
+            )
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert len(results) == 3
+        assert all(
+            set(title) == {'id', 'name', 'rating'} for title in results
+        ), (
+            'Проверьте, что `?fields=` оставляет в ответе только '
+            'перечисленные поля.'
+        )
+
+    def test_02_title_columns(self, client):
+        create_catalogue(1)
+        with CaptureQueriesContext(connection) as context:
+            client.get(self.TITLES_URL, {'fields': 'id,name'})
+        sql = context.captured_queries[-1]['sql']
+        assert '"description"' not in sql and '"rating_sum"' not in sql, (
+            'Проверьте, что невыбранные поля не загружаются из БД.'
+        )
+
+    def test_03_title_exclude(self, client, django_assert_num_queries):
+        title = create_catalogue(1)
+        # Произведение с категорией, жанры не загружаются.
+        with django_assert_num_queries(1):
+            response = client.get(
+                self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title.id),
+                {'exclude': 'genre,description'}
+            )
+        assert response.json() == {
+            'id': title.id, 'name': title.name, 'year': 2000,
+            'rating': None,
+            'category': {'name': 'Категория 0', 'slug': 'category-0'},
+        }, 'Проверьте, что `?exclude=` убирает поля из ответа.'
+
+    def test_04_title_stats_fields(self, client):
+        title = create_catalogue(1)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+        response = client.get(url, {'include': 'stats', 'fields': 'stats'})
+        assert list(response.json()) == ['stats'], (
+            'Проверьте, что статистику можно запросить отдельно от '
+            'остальных полей.'
+        )
+        response = client.get(url, {'include': 'stats', 'fields': 'id'})
+        assert list(response.json()) == ['id']
+
+    def test_05_unknown_field(self, client):
+        create_catalogue(1)
+        response = client.get(self.TITLES_URL, {'fields': 'id,secret'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что неизвестное поле в `?fields=` даёт ответ 400.'
+        )
+        assert 'fields' in response.json()
+        response = client.get(self.TITLES_URL, {'fields': 'stats'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что статистика выбирается только с '
+            '`?include=stats`.'
+        )
+
+    def test_06_review_and_comment_fields(self, client, django_user_model,
+                                          django_assert_num_queries):
+        review = create_discussion(django_user_model, 3)
+        # COUNT для пагинации и отзывы без авторов.
+        with django_assert_num_queries(3):
+            response = client.get(
+                self.REVIEWS_URL_TEMPLATE.format(title_id=review.title_id),
+                {'fields': 'id,score'}
+            )
+        assert all(
+            set(item) == {'id', 'score'}
+            for item in response.json()['results']
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=review.title_id, review_id=review.id
+        )
+        response = client.get(url, {'exclude': 'author', 'pagination': 'cursor'})
+        assert response.status_code == HTTPStatus.OK
+        assert all(
+            set(item) == {'id', 'text', 'pub_date'}
+            for item in response.json()['results']
+        ), (
+            'Проверьте, что `?exclude=` работает для комментариев.'
+        )
+
+    def test_07_write_ignores_fields(self, user_client):
+        title = create_catalogue(1)
+        response = user_client.post(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+            + '?fields=id',
+            data={'text': 'Отзыв', 'score': 7}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert set(response.json()) == {
+            'id', 'text', 'author', 'score', 'pub_date'
+        }, 'Проверьте, что `?fields=` не влияет на ответ на запись.'
@@ -0,0 +1,49 @@
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+
+from reviews.models import Genre
+from reviews.sqlite import read_pragma
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20Sqlite:
+
+    def test_01_connection_pragmas(self):
+        connection.close()
+        with connection.cursor() as cursor:
+            assert read_pragma(cursor, 'busy_timeout') == (
+                settings.SQLITE_PRAGMAS['busy_timeout']
+            ), 'Проверьте, что busy_timeout задаётся каждому соединению.'
+            # 1 — NORMAL.
+            assert read_pragma(cursor, 'synchronous') == 1
+            assert read_pragma(cursor, 'cache_size') == (
+                settings.SQLITE_PRAGMAS['cache_size']
+            )
+
+    def test_02_db_maintain(self):
+        Genre.objects.bulk_create(
+            Genre(name='x' * 200, slug=f'genre-{idx}') for idx in range(500)
+        )
+        Genre.objects.all().delete()
+        out = StringIO()
+        call_command('db_maintain', enable_incremental=True, stdout=out)
+        output = out.getvalue()
+        assert 'До:' in output and 'После:' in output, (
+            'Проверьте, что команда `db_maintain` выводит статистику '
+            'страниц до и после обслуживания.'
+        )
+        with connection.cursor() as cursor:
+            assert read_pragma(cursor, 'auto_vacuum') == 2
+            assert read_pragma(cursor, 'freelist_count') == 0, (
+                'Проверьте, что свободные страницы возвращаются файлу.'
+            )
+            cursor.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            )
+            assert cursor.fetchone()[0] == 1, (
+                'Проверьте, что `db_maintain` собирает статистику ANALYZE.'
+            )
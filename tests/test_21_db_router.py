@@ -0,0 +1,175 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.test import RequestFactory
+from rest_framework.response import Response
+
+from api.authentication import ClaimsAccessToken
+from api.middleware import ReplicaRoutingMiddleware
+from api.views import CategoryViewSet, TitleViewSet
+from api_yamdb.db_router import PrimaryReplicaRouter, read_from
+from reviews.models import MODERATOR, Category, Title
+from reviews.versions import bump_version
+
+REPLICA = 'replica1'
+CATEGORIES_URL = '/api/v1/categories/'
+
+
+def read_alias(request):
+    return PrimaryReplicaRouter().db_for_read(Title)
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.READ_REPLICAS = [REPLICA]
+
+
+@pytest.fixture
+def make_replica(tmp_path, settings):
+    '''Реплика — файл SQLite со снимком основной БД на момент вызова.'''
+    path = tmp_path / 'replica.sqlite3'
+
+    def make():
+        with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+            cursor.execute('VACUUM INTO %s', [str(path)])
+        connections.databases[REPLICA] = {
+            'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(path),
+        }
+        settings.READ_REPLICAS = [REPLICA]
+
+    yield make
+    if REPLICA in connections.databases:
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.databases[REPLICA]
+
+
+def category_slugs(response):
+    return {category['slug'] for category in response.json()['results']}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21DbRouter:
+
+    middleware = ReplicaRoutingMiddleware(read_alias)
+    factory = RequestFactory()
+
+    def request(self, method, authorization='Bearer one'):
+        return self.middleware(getattr(self.factory, method)(
+            '/api/v1/titles/', HTTP_AUTHORIZATION=authorization
+        ))
+
+    def test_01_reads_go_to_replica(self, replicas):
+        assert self.request('get') == REPLICA, (
+            'Проверьте, что GET-запросы читают из реплики.'
+        )
+        assert self.request('post') == DEFAULT_DB_ALIAS, (
+            'Проверьте, что запросы на запись читают из основной БД.'
+        )
+        router = PrimaryReplicaRouter()
+        assert router.db_for_write(Title) == DEFAULT_DB_ALIAS
+        assert router.db_for_read(Title) == DEFAULT_DB_ALIAS, (
+            'Проверьте, что вне запроса чтение идёт в основную БД.'
+        )
+
+    def test_02_read_your_writes(self, replicas, settings):
+        self.request('patch')
+        assert self.request('get') == DEFAULT_DB_ALIAS, (
+            'Проверьте, что после записи клиент читает из основной БД.'
+        )
+        assert self.request('get', 'Bearer two') == REPLICA, (
+            'Проверьте, что запись одного клиента не переключает чтение '
+            'остальных.'
+        )
+        settings.PRIMARY_PIN_SECONDS = 0
+        self.request('delete', 'Bearer two')
+        assert self.request('get', 'Bearer two') == REPLICA
+
+    def test_03_atomic_reads_primary(self, replicas):
+        def read_in_transaction(request):
+            with transaction.atomic():
+                return read_alias(request)
+
+        middleware = ReplicaRoutingMiddleware(read_in_transaction)
+        assert middleware(self.factory.get('/')) == DEFAULT_DB_ALIAS, (
+            'Проверьте, что внутри транзакции чтение идёт в основную БД.'
+        )
+
+    def test_04_without_replicas(self):
+        assert self.request('get') == DEFAULT_DB_ALIAS
+
+    def test_05_replica_cache_timeout(self, settings):
+        view = TitleViewSet()
+        assert view.get_cache_timeout() == settings.API_CACHE_TIMEOUT
+        with read_from(REPLICA):
+            assert view.get_cache_timeout() == (
+                settings.PRIMARY_PIN_SECONDS
+            ), (
+                'Проверьте, что ответ из реплики кэшируется не дольше '
+                'PRIMARY_PIN_SECONDS.'
+            )
+
+    def test_06_no_etag_for_lagging_replica(self, settings):
+        view = CategoryViewSet()
+
+        def list_action(request):
+            return Response([])
+
+        bump_version(Category)
+        assert view.versions_match_data(), (
+            'Проверьте, что чтение из основной БД получает ETag.'
+        )
+        with read_from(REPLICA):
+            assert not view.versions_match_data()
+            response = view.get_conditional_response(list_action, None)
+            assert 'ETag' not in response, (
+                'Проверьте, что ответ из реплики сразу после записи не '
+                'получает ETag: реплика может ещё не видеть запись.'
+            )
+        settings.PRIMARY_PIN_SECONDS = 0
+        bump_version(Category)
+        with read_from(REPLICA):
+            assert view.versions_match_data(), (
+                'Проверьте, что после PRIMARY_PIN_SECONDS ответы из реплики '
+                'снова получают ETag.'
+            )
+
+    def test_07_real_replica(self, make_replica, client, admin_client):
+        Category.objects.create(name='Книги', slug='books')
+        make_replica()
+        # Запись после снимка: реплика её ещё не видит.
+        Category.objects.create(name='Фильмы', slug='movies')
+        response = client.get(CATEGORIES_URL)
+        assert category_slugs(response) == {'books'}, (
+            'Проверьте, что GET-запросы читают из реплики.'
+        )
+        assert 'ETag' not in response
+
+        admin_client.post(
+            CATEGORIES_URL, data={'name': 'Музыка', 'slug': 'music'}
+        )
+        assert category_slugs(client.get(CATEGORIES_URL)) == {'books'}, (
+            'Проверьте, что запись одного клиента не переключает чтение '
+            'остальных на основную БД.'
+        )
+        assert category_slugs(admin_client.get(CATEGORIES_URL)) == {
+            'books', 'movies', 'music'
+        }, (
+            'Проверьте, что после записи клиент читает из основной БД и не '
+            'получает список из кэша, заполненного репликой.'
+        )
+
+    def test_08_token_version_from_primary(self, make_replica, client,
+                                           user):
+        token = ClaimsAccessToken.for_user(user)
+        make_replica()
+        user.role = MODERATOR
+        user.save()
+        response = client.get(
+            CATEGORIES_URL, HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что версия токена читается из основной БД: реплика '
+            'может ещё не видеть отзыв токена.'
+        )
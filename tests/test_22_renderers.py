@@ -0,0 +1,76 @@
+import io
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from api import parsers, renderers
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+from tests.test_08_queries import create_catalogue
+
+DATA = {
+    'name': 'Произведение «цитата»',
+    'date': datetime(2020, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+    'price': Decimal('1.50'),
+    'lazy': gettext_lazy('Оценка'),
+    'items': [1, 2.5, None, True],
+}
+# orjson — необязательная зависимость: без него проверяется только запасной
+# путь через json.
+requires_orjson = pytest.mark.skipif(
+    renderers.orjson is None, reason='orjson не установлен'
+)
+
+
+class Test22Renderers:
+
+    @requires_orjson
+    def test_01_same_output(self):
+        assert FastJSONRenderer().render(DATA) == JSONRenderer().render(
+            DATA
+        ), 'Проверьте, что FastJSONRenderer выводит то же, что JSONRenderer.'
+        assert FastJSONRenderer().render(None) == b''
+
+    def test_02_indent_and_fallback(self, monkeypatch):
+        media_type = 'application/json; indent=2'
+        assert FastJSONRenderer().render(DATA, media_type) == (
+            JSONRenderer().render(DATA, media_type)
+        ), 'Проверьте, что отступы из Accept поддерживаются.'
+        monkeypatch.setattr(renderers, 'orjson', None)
+        assert FastJSONRenderer().render(DATA) == JSONRenderer().render(
+            DATA
+        ), 'Проверьте, что без orjson рендерер работает на json.'
+
+    @pytest.mark.parametrize(
+        'use_orjson', (pytest.param(True, marks=requires_orjson), False)
+    )
+    def test_03_parser(self, monkeypatch, use_orjson):
+        if not use_orjson:
+            monkeypatch.setattr(parsers, 'orjson', None)
+        parser = FastJSONParser()
+        assert parser.parse(
+            io.BytesIO('{"text": "Отзыв", "score": 7}'.encode())
+        ) == {'text': 'Отзыв', 'score': 7}
+        with pytest.raises(ParseError):
+            parser.parse(io.BytesIO(b'{"text": '))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22JsonApi:
+
+    def test_01_json_request(self, user_client):
+        title = create_catalogue(1)
+        response = user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            data={'text': 'Отзыв', 'score': 7}, format='json'
+        )
+        assert response.status_code == 201, (
+            'Проверьте, что отзыв создаётся из JSON.'
+        )
+        response = user_client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert response['Content-Type'] == 'application/json'
+        assert response.json()['results'][0]['text'] == 'Отзыв'
@@ -0,0 +1,85 @@
+import gzip
+import json
+from http import HTTPStatus
+
+import pytest
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+
+from tests.test_08_queries import create_catalogue
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23Compression:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_gzip_api_response(self, client):
+        create_catalogue(10)
+        plain = client.get(self.TITLES_URL)
+        assert 'Content-Encoding' not in plain, (
+            'Проверьте, что без Accept-Encoding ответ не сжимается.'
+        )
+        response = client.get(self.TITLES_URL, HTTP_ACCEPT_ENCODING='gzip')
+        assert response['Content-Encoding'] == 'gzip', (
+            'Проверьте, что большие ответы API сжимаются gzip.'
+        )
+        assert 'Accept-Encoding' in response['Vary']
+        assert json.loads(gzip.decompress(response.content)) == plain.json()
+
+    def test_02_small_response(self, client):
+        response = client.get(
+            '/api/v1/categories/', HTTP_ACCEPT_ENCODING='gzip'
+        )
+        assert 'Content-Encoding' not in response, (
+            'Проверьте, что ответы меньше COMPRESS_MIN_SIZE не сжимаются.'
+        )
+
+    def test_03_weak_etag(self, client):
+        create_catalogue(10)
+        response = client.get(self.TITLES_URL, HTTP_ACCEPT_ENCODING='gzip')
+        assert response['ETag'].startswith('W/')
+        response = client.get(
+            self.TITLES_URL, HTTP_ACCEPT_ENCODING='gzip',
+            HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что слабый ETag сжатого ответа даёт 304.'
+        )
+
+    def test_04_streaming(self, admin_client):
+        create_catalogue(50)
+        response = admin_client.get(
+            '/api/v1/export/titles.csv', HTTP_ACCEPT_ENCODING='gzip'
+        )
+        assert response.streaming
+        assert response['Content-Encoding'] == 'gzip'
+        content = gzip.decompress(b''.join(response.streaming_content))
+        assert content.decode().count('\n') == 51, (
+            'Проверьте, что потоковые ответы сжимаются по частям.'
+        )
+
+    def test_05_precompressed_static(self, client, settings, tmp_path):
+        settings.STATIC_ROOT = tmp_path
+        call_command('collectstatic', interactive=False, verbosity=0)
+        hashed = staticfiles_storage.stored_name('redoc.yaml')
+        assert (tmp_path / f'{hashed}.gz').exists(), (
+            'Проверьте, что collectstatic сохраняет сжатые копии статики.'
+        )
+        url = f'/static/{hashed}'
+        response = client.get(url, HTTP_ACCEPT_ENCODING='gzip, br')
+        assert response['Content-Encoding'] == 'gzip'
+        assert 'immutable' in response['Cache-Control'], (
+            'Проверьте, что статика с хэшем кэшируется надолго.'
+        )
+        content = gzip.decompress(b''.join(response.streaming_content))
+        assert content == (tmp_path / hashed).read_bytes()
+        response = client.get('/static/redoc.yaml')
+        assert 'Content-Encoding' not in response
+        assert 'Cache-Control' not in response
+        assert client.get('/static/missing.yaml').status_code == (
+            HTTPStatus.NOT_FOUND
+        )
+        assert hashed in client.get('/redoc/').content.decode(), (
+            'Проверьте, что redoc ссылается на статику с хэшем.'
+        )
@@ -0,0 +1,116 @@
+import asyncio
+import gzip
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from django.test import AsyncClient
+from django.urls import path
+
+from api.metrics import registry
+from api_yamdb.asgi import application
+from api.views import ReviewViewSet, TitleViewSet
+from tests.test_08_queries import create_catalogue
+
+
+@pytest.fixture
+def async_reads(settings):
+    '''URL с представлениями, собранными при включённом ASYNC_READS.'''
+    settings.ASYNC_READS = True
+
+    class AsyncUrls:
+        urlpatterns = [
+            path(
+                'titles/', TitleViewSet.as_view({'get': 'list'}),
+                name='titles-list'
+            ),
+            path(
+                'titles/<int:title_id>/reviews/',
+                ReviewViewSet.as_view({'get': 'list', 'post': 'create'}),
+                name='reviews-list'
+            ),
+        ]
+
+    settings.ROOT_URLCONF = AsyncUrls
+    return AsyncUrls
+
+
+@async_to_sync
+async def asgi_get(path, headers):
+    '''GET через приложение ASGI целиком: статус, заголовки и тело.'''
+    communicator = ApplicationCommunicator(application, {
+        'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'',
+        'headers': [
+            (name.encode(), value.encode()) for name, value in headers.items()
+        ],
+    })
+    await communicator.send_input({'type': 'http.request'})
+    start = await communicator.receive_output(5)
+    body = b''
+    while True:
+        message = await communicator.receive_output(5)
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            return start['status'], dict(start['headers']), body
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24Asgi:
+
+    def test_01_views_switch(self, settings):
+        assert not asyncio.iscoroutinefunction(
+            TitleViewSet.as_view({'get': 'list'})
+        ), 'Проверьте, что без ASYNC_READS представления синхронные.'
+        settings.ASYNC_READS = True
+        view = TitleViewSet.as_view({'get': 'list'})
+        assert asyncio.iscoroutinefunction(view), (
+            'Проверьте, что с ASYNC_READS представления асинхронные.'
+        )
+        assert view.cls is TitleViewSet and view.csrf_exempt
+
+    def test_02_async_read(self, async_reads):
+        create_catalogue(3)
+        registry.reset()
+        response = async_to_sync(AsyncClient().get)('/titles/')
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()['results']) == 3, (
+            'Проверьте, что асинхронный list возвращает произведения.'
+        )
+        assert registry.snapshot()['titles-list']['queries']['max'] >= 1, (
+            'Проверьте, что метрики считают запросы асинхронных '
+            'представлений.'
+        )
+
+    def test_03_async_write(self, async_reads, token_user):
+        title = create_catalogue(1)
+        client = AsyncClient()
+        # AsyncClient Django 3.2 передаёт заголовки именованными аргументами.
+        response = async_to_sync(client.post)(
+            f'/titles/{title.id}/reviews/',
+            {'text': 'Отзыв', 'score': 7}, content_type='application/json',
+            authorization=f'Bearer {token_user["access"]}'
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что запись работает через асинхронное '
+            'представление.'
+        )
+        response = async_to_sync(client.get)(f'/titles/{title.id}/reviews/')
+        assert response.json()['results'][0]['text'] == 'Отзыв'
+
+    @pytest.mark.parametrize('encoding', ('identity', 'gzip'))
+    def test_04_streaming_export(self, token_admin, encoding):
+        create_catalogue(3)
+        status, headers, body = asgi_get('/api/v1/export/titles.ndjson', {
+            'authorization': f'Bearer {token_admin["access"]}',
+            'accept-encoding': encoding,
+        })
+        assert status == HTTPStatus.OK, (
+            'Проверьте, что выгрузка под ASGI читает БД вне цикла событий.'
+        )
+        if encoding == 'gzip':
+            assert headers[b'Content-Encoding'] == b'gzip'
+            body = gzip.decompress(body)
+        assert len(body.splitlines()) == 3, (
+            'Проверьте, что выгрузка под ASGI отдаёт все строки.'
+        )
@@ -0,0 +1,154 @@
+import csv
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from reviews.models import Category, Genre, Review, Title, TitleStats
+
+FILES = {
+    'users.csv': (
+        ('id', 'username', 'email', 'role', 'bio', 'first_name',
+         'last_name'),
+        [(idx, f'csv{idx}', f'csv{idx}@yamdb.fake', 'user', '', '', '')
+         for idx in range(1, 4)]
+    ),
+    'category.csv': (('id', 'name', 'slug'), [(1, 'Фильм', 'movie')]),
+    'genre.csv': (
+        ('id', 'name', 'slug'),
+        [(1, 'Драма', 'drama'), (2, 'Комедия', 'comedy')]
+    ),
+    'titles.csv': (
+        ('id', 'name', 'year', 'category'),
+        [(idx, f'Произведение {idx}', 2000, 1) for idx in range(1, 6)]
+    ),
+    'genre_title.csv': (
+        ('id', 'title_id', 'genre_id'), [(1, 1, 1), (2, 1, 2), (3, 2, 1)]
+    ),
+    'review.csv': (
+        ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+        [(1, 1, 'Да', 1, 4, '2020-01-01T00:00:00Z'),
+         (2, 1, 'Нет', 2, 9, '2020-01-02T00:00:00Z'),
+         (3, 2, 'Так', 3, 7, '2020-01-03T00:00:00Z')]
+    ),
+}
+
+
+def write_files(path, files=FILES):
+    for name, (header, rows) in files.items():
+        with open(path / name, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(header)
+            writer.writerows(rows)
+
+
+def import_files(path, *commands, batch_size=2):
+    out = StringIO()
+    for command in commands:
+        call_command(command, path=path, batch_size=batch_size, stdout=out)
+    return out.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25CsvImport:
+
+    CATALOGUE = ('csv1user', 'csv2genre', 'csv3category', 'csv4title')
+
+    def test_01_batches_and_path(self, tmp_path):
+        write_files(tmp_path)
+        output = import_files(tmp_path, *self.CATALOGUE)
+        assert Title.objects.count() == 5, (
+            'Проверьте, что импорт читает файлы из каталога `--path` и '
+            'записывает все пачки, включая неполную последнюю.'
+        )
+        assert 'titles.csv: 5 строк' in output
+        assert TitleStats.objects.count() == 5, (
+            'Проверьте, что импорт произведений создаёт их статистику.'
+        )
+
+    def test_02_reimport_ignores_conflicts(self, tmp_path):
+        write_files(tmp_path)
+        import_files(tmp_path, *self.CATALOGUE)
+        Category.objects.filter(pk=1).update(name='Изменено')
+        import_files(tmp_path, *self.CATALOGUE)
+        assert Title.objects.count() == 5 and Genre.objects.count() == 2, (
+            'Проверьте, что повторный импорт пропускает существующие строки.'
+        )
+        assert Category.objects.get(pk=1).name == 'Изменено'
+
+    def test_03_genre_through_table(self, tmp_path):
+        write_files(tmp_path)
+        import_files(tmp_path, *self.CATALOGUE, 'csv5genretitle')
+        assert sorted(
+            Title.objects.get(pk=1).genre.values_list('slug', flat=True)
+        ) == ['comedy', 'drama'], (
+            'Проверьте, что импорт заполняет связи произведений и жанров.'
+        )
+        assert Title.objects.get(pk=2).genre.count() == 1
+
+    def test_04_rating_recount(self, tmp_path):
+        write_files(tmp_path)
+        import_files(tmp_path, *self.CATALOGUE, 'csv6review')
+        title = Title.objects.get(pk=1)
+        assert (title.rating_sum, title.rating_count) == (13, 2), (
+            'Проверьте, что импорт отзывов пересчитывает рейтинг.'
+        )
+        assert title.stats.review_count == 2
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2020, (
+            'Проверьте, что импорт сохраняет даты из файла.'
+        )
+        review.text = 'Правка'
+        review.save()
+        assert Review.objects.get(pk=1).pub_date.year > 2020, (
+            'Проверьте, что правка отзыва по-прежнему обновляет дату.'
+        )
+
+    @pytest.mark.parametrize('score', ('11', '0', 'много'))
+    def test_05_invalid_row(self, tmp_path, score):
+        write_files(tmp_path)
+        header, rows = FILES['review.csv']
+        write_files(tmp_path, {'review.csv': (
+            header, rows + [(4, 3, 'Плохо', 1, score, '2020-01-04T00:00:00Z')]
+        )})
+        import_files(tmp_path, *self.CATALOGUE)
+        with pytest.raises(CommandError, match='строка 5, колонка score'):
+            import_files(tmp_path, 'csv6review')
+        assert not Review.objects.filter(pk=4).exists(), (
+            'Проверьте, что строка с недопустимой оценкой не импортируется.'
+        )
+        # Пачки до ошибочной строки уже записаны.
+        assert Review.objects.count() == 2
+
+    def test_06_csvall_skips_dependents_of_failed_stage(
+        self, tmp_path, django_user_model
+    ):
+        write_files(tmp_path, {
+            name: content for name, content in FILES.items()
+            if name != 'category.csv'
+        })
+        err = StringIO()
+        with pytest.raises(CommandError, match='ошибки в csv3category$'):
+            call_command(
+                'csvall', path=tmp_path, workers=1,
+                stdout=StringIO(), stderr=err,
+            )
+        err = err.getvalue()
+        assert 'csv3category: ошибка' in err, (
+            'Проверьте, что `csvall` сообщает об ошибке этапа.'
+        )
+        for command, blocked in (
+            ('csv4title', 'csv3category'),
+            ('csv5genretitle', 'csv4title'),
+            ('csv6review', 'csv4title'),
+            ('csv7comment', 'csv6review'),
+        ):
+            assert f'{command}: пропущен, не выполнены {blocked}\n' in err, (
+                f'Проверьте, что `{command}` пропускается и сообщение '
+                'называет только невыполненные этапы, от которых он зависит.'
+            )
+        assert django_user_model.objects.count() == 3, (
+            'Проверьте, что независимые этапы импорта выполняются.'
+        )
+        assert Genre.objects.count() == 2
+        assert not Title.objects.exists() and not Review.objects.exists()
@@ -0,0 +1,127 @@
+import pytest
+from django.core.management import CommandError, call_command
+
+from reviews.models import Review, Title
+
+
+def get_rating(title):
+    title = Title.objects.get(pk=title.pk)
+    return title.rating_sum, title.rating_count
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26TitleRating:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_rating_follows_reviews(self, admin, user):
+        title = Title.objects.create(name='Произведение', year=2000)
+        other = Title.objects.create(name='Другое', year=2001)
+        first = Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=9
+        )
+        second = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=3
+        )
+        assert get_rating(title) == (12, 2), (
+            'Проверьте, что новый отзыв добавляется к сумме и количеству '
+            'оценок произведения.'
+        )
+        assert Title.objects.get(pk=title.pk).rating == 6
+
+        second.score = 5
+        second.save()
+        assert get_rating(title) == (14, 2), (
+            'Проверьте, что смена оценки меняет только сумму оценок.'
+        )
+
+        first.title = other
+        first.save()
+        assert (get_rating(title), get_rating(other)) == ((5, 1), (9, 1)), (
+            'Проверьте, что перенос отзыва переносит его оценку в другое '
+            'произведение.'
+        )
+
+        second.delete()
+        assert get_rating(title) == (0, 0), (
+            'Проверьте, что удаление отзыва вычитает его оценку.'
+        )
+        assert Title.objects.get(pk=title.pk).rating is None
+
+    def test_02_deferred_review(self, admin, user):
+        title = Title.objects.create(name='Произведение', year=2000)
+        other = Title.objects.create(name='Другое', year=2001)
+        review = Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=9
+        )
+        Review.objects.create(title=title, author=user, text='Да', score=3)
+        review = Review.objects.only('id', 'text').get(pk=review.pk)
+        review.title_id = other.pk
+        review.save()
+        assert (get_rating(title), get_rating(other)) == ((3, 1), (9, 1)), (
+            'Проверьте, что перенос отзыва, загруженного без произведения '
+            'и оценки, переносит оценку из прежнего произведения.'
+        )
+        Review.objects.only('id').get(pk=review.pk).delete()
+        assert get_rating(other) == (0, 0), (
+            'Проверьте, что удаление отзыва, загруженного без оценки, '
+            'вычитает его оценку.'
+        )
+        assert get_rating(title) == (3, 1)
+        call_command('rebuild_title_stats', check=True)
+
+    def test_03_cascade_delete(self, admin, user):
+        title = Title.objects.create(name='Произведение', year=2000)
+        other = Title.objects.create(name='Другое', year=2001)
+        for author, score in ((admin, 8), (user, 2)):
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=score
+            )
+            Review.objects.create(
+                title=other, author=author, text='Отзыв', score=score
+            )
+        title.delete()
+        assert not Review.objects.filter(title_id=title.pk).exists(), (
+            'Проверьте, что удаление произведения удаляет его отзывы.'
+        )
+        assert get_rating(other) == (10, 2), (
+            'Проверьте, что удаление произведения не меняет рейтинг других.'
+        )
+        user.delete()
+        assert get_rating(other) == (8, 1), (
+            'Проверьте, что удаление автора вычитает оценки его отзывов.'
+        )
+
+    def test_04_rebuild_ratings(self, admin, user):
+        title = Title.objects.create(name='Произведение', year=2000)
+        other = Title.objects.create(name='Другое', year=2001)
+        Review.objects.create(title=title, author=admin, text='Да', score=7)
+        Review.objects.create(title=other, author=user, text='Да', score=4)
+        call_command('rebuild_ratings', check=True)
+
+        Title.objects.filter(pk=title.pk).update(rating_sum=1, rating_count=5)
+        with pytest.raises(CommandError, match='у 1 произведений'):
+            call_command('rebuild_ratings', check=True)
+        assert get_rating(title) == (1, 5), (
+            'Проверьте, что `rebuild_ratings --check` не исправляет рейтинг.'
+        )
+
+        call_command('rebuild_ratings')
+        assert (get_rating(title), get_rating(other)) == ((7, 1), (4, 1)), (
+            'Проверьте, что `rebuild_ratings` пересчитывает рейтинг по '
+            'отзывам.'
+        )
+        call_command('rebuild_ratings', check=True)
+
+    def test_05_rebuild_resets_cached_list(self, client, admin):
+        title = Title.objects.create(name='Произведение', year=2000)
+        Review.objects.create(title=title, author=admin, text='Да', score=7)
+        Title.objects.filter(pk=title.pk).update(rating_sum=2, rating_count=1)
+        response = client.get(self.TITLES_URL)
+        assert response.json()['results'][0]['rating'] == 2
+        call_command('rebuild_ratings')
+        response = client.get(self.TITLES_URL)
+        assert response.json()['results'][0]['rating'] == 7, (
+            'Проверьте, что `rebuild_ratings` сбрасывает кэш списка '
+            'произведений.'
+        )